@@ -1,77 +1,171 @@
 from functools import wraps
-from flask import Flask, redirect, render_template, request, url_for
+from flask import Flask, Response, make_response, redirect, render_template, request, url_for
 from monopoly import actions
+from monopoly.engine import apply_batch, auto_resolve
+from monopoly.broadcast import Broadcaster, message
+from monopoly.fragments import FragmentCache
 from monopoly.game import Game
 from monopoly.server import GameServer
+from monopoly.summary import dumps, summarize
 from monopoly.view import View
 
 
-def configure_routing(app: Flask, server: GameServer):
+def configure_routing(app: Flask, server: GameServer, fragments: FragmentCache | None=None, broadcaster: Broadcaster | None=None, keepalive: float=15):
     logger = app.logger
+    fragments = fragments or FragmentCache()
+    broadcaster = broadcaster or Broadcaster()
+    app.jinja_env.globals['fragment'] = fragments.render
+
+    def publish(id, state, action):
+        render = lambda: message('state', render_template('partials/state.html', **View.create(id, state, action)))
+        broadcaster.publish(int(id), render)
+
+    def wants_json():
+        return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+    def respond(id, state, action, html, status=200, **extra):
+        if wants_json():
+            document = {'action': action, 'state': summarize(id, state), **extra}
+            return app.response_class(dumps(document), status=status, mimetype='application/json')
+        return html()
 
     def update_state(func):
         @wraps(func)
         def inner(id, *args, **kwargs):
-            game, state = server.get(int(id))
-            action = func(game, *args, **kwargs)
+            with server.checkout(int(id)) as (game, state):
+                action = func(game, *args, **kwargs)
 
-            state.action = action if action else game.resume()
-            view = View.create(id, state, state.action)
-            return render_template('partials/state.html', **view)
+                game.updater.set_action(action if action else game.resume())
+                steps, _ = auto_resolve(game, state.action)
+                publish(id, state, state.action)
+                html = lambda: render_template('partials/state.html', **View.create(id, state, state.action, steps))
+                return respond(id, state, state.action, html, steps=steps)
         
         return inner
     
     def update_property(func):
         @wraps(func)
         def inner(id, property, *args, **kwargs):
-            game, state = server.get(int(id))
+            with server.checkout(int(id)) as (game, state):
+                amount = request.args.get('amount')
+                func(game, int(property), int(amount), *args, **kwargs)
 
-            amount = request.args.get('amount')
-            func(game, int(property), int(amount), *args, **kwargs)
-
-            view = View.create(id, state, action=None)
-            return render_template('partials/view/players.html', **view)
+                publish(id, state, state.action)
+                render = lambda: render_template('partials/view/players.html', **View.create(id, state, action=None))
+                html = lambda: fragments.get(id, 'partials/view/players.html', state.version, render)
+                return respond(id, state, state.action, html)
         
         return inner
     
     def update_auction(func):
         @wraps(func)
         def inner(id, *args, **kwargs):
-            game, state = server.get(int(id))
-
-            actions = func(game, *args, **kwargs)
+            with server.checkout(int(id)) as (game, state):
+                actions = func(game, *args, **kwargs)
 
-            view = View.create(id, state, action=actions)
-            return render_template('partials/auction.html', **view)
+                game.updater.set_action(actions)
+                publish(id, state, actions)
+                html = lambda: render_template('partials/auction.html', **View.create(id, state, action=actions))
+                return respond(id, state, actions, html)
         
         return inner
 
+    def conditional(func):
+        @wraps(func)
+        def inner(id, *args, **kwargs):
+            version = server.version(int(id))
+            if version is None:
+                return func(id, *args, **kwargs)
+
+            etag = f'{server.epoch}-{id}-{version}' + ('-json' if wants_json() else '')
+            if etag in request.if_none_match:
+                response = app.response_class(status=304)
+            else:
+                response = make_response(func(id, *args, **kwargs))
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Accept')
+            return response
+
+        return inner
+
     @app.get('/')
     def create():
         game = server.create()
-        return redirect(url_for('join', id=game))
+        if not wants_json():
+            return redirect(url_for('join', id=game))
+
+        _, state = server.get(game)
+        response = respond(game, state, actions.roll(), None, status=201)
+        response.headers['Location'] = url_for('join', id=game)
+        return response
 
     @app.get('/<id>')
+    @conditional
     def join(id):
         id = int(id)
         if not server.exists(id):
-            return redirect(url_for('create'))
+            return ({'error': 'Game not found'}, 404) if wants_json() else redirect(url_for('create'))
         
-        _, state = server.get(id)
-
-        view = View.create(id, state, action=actions.roll())
-        return render_template('index.html', **view)
+        with server.read(id) as (_, state):
+            action = state.action or actions.roll()
+            html = lambda: render_template('index.html', **View.create(id, state, action))
+            return respond(id, state, action, html)
     
+    @app.get('/<id>/events')
+    def events(id):
+        id = int(id)
+        if not server.exists(id):
+            return 'Game not found', 404
+
+        def stream():
+            subscription = broadcaster.subscribe(id)
+            try:
+                yield ': connected\n\n'
+                while True:
+                    yield subscription.get(keepalive) or ': keepalive\n\n'
+            finally:
+                broadcaster.unsubscribe(id, subscription)
+
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        return Response(stream(), mimetype='text/event-stream', headers=headers)
+
     @app.get('/<id>/properties/<property>')
+    @conditional
     def get_property(id, property):
         id = int(id)
-        game, state = server.get(id)
+        with server.read(id) as (game, state):
+            action = game.use_property(int(property))
 
-        action = game.use_property(int(property))
-
-        view = View.create(id, state, action)
-        return render_template('partials/property.html', **view)
+            html = lambda: render_template('partials/property.html', **View.create(id, state, action))
+            return respond(id, state, action, html)
     
+    @app.post('/<id>/batch')
+    def batch(id):
+        body = request.get_json(silent=True)
+        batch = body.get('actions') if isinstance(body, dict) else body
+        if not isinstance(batch, list) or not all(isinstance(action, dict) and 'action' in action for action in batch):
+            return {'error': 'Expected a list of actions'}, 400
+
+        with server.checkout(int(id)) as (game, state):
+            try:
+                applied, pending = apply_batch(game, batch)
+            except (KeyError, IndexError, TypeError, ValueError) as error:
+                logger.warning('Batch for game %s rolled back: %r', id, error)
+                return {'error': f'Batch rolled back: {error!r}'}, 400
+
+            steps, pending = auto_resolve(game, pending)
+            publish(id, state, pending)
+            html = lambda: render_template('partials/state.html', **View.create(id, state, pending, steps))
+            return respond(id, state, pending, html, applied=applied, steps=steps)
+
+    @app.post('/<id>/auto')
+    @update_state
+    def auto(game: Game):
+        enabled = request.args.get('enabled', 'true')
+        game.updater.set_auto(enabled.lower() not in ('0', 'false', 'off'))
+        return game.state.action or actions.roll()
+
     @app.post('/<id>/mortgage/<property>')
     @update_property
     def mortgage(game: Game, property: int, amount: int):
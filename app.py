@@ -1,12 +1,26 @@
+import os
 from api import configure_routing
 from flask import Flask
 
-from monopoly.server import Board, GameServer
+from monopoly.fragments import FragmentCache
+from monopoly.server import Board, BoardCatalog, GameServer, LocalBoard
+from monopoly.store import MemoryStore, SpillStore, SqliteStore
 
 
 def create_app():
     ''' Default factory method for Flask CLI runner '''
     app = Flask(__name__)
-    board = Board(3000)
-    server = GameServer(board)
-    return configure_routing(app, server)
+    path = os.environ.get('MONOPOLY_BOARD')
+    source = LocalBoard(path) if path else Board(3000)
+    board = BoardCatalog(source, ttl=float(os.environ.get('MONOPOLY_BOARD_TTL', 60)))
+    spill, database = os.environ.get('MONOPOLY_SPILL'), os.environ.get('MONOPOLY_DB')
+    capacity = int(os.environ.get('MONOPOLY_CAPACITY', 1000))
+    if database:
+        store = SqliteStore(database, cache_size=capacity)
+    elif spill:
+        store = SpillStore(spill, capacity=capacity)
+    else:
+        store = MemoryStore()
+    server = GameServer(board, store)
+    fragments = FragmentCache(int(os.environ.get('MONOPOLY_FRAGMENTS', 1000)))
+    return configure_routing(app, server, fragments)
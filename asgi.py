@@ -0,0 +1,232 @@
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+from functools import wraps
+from quart import Quart, make_response, redirect, render_template, request, url_for
+from monopoly import actions
+from monopoly.broadcast import AsyncSubscription, Broadcaster, message
+from monopoly.engine import AUCTION_ACTIONS, PROPERTY_ACTIONS, STATE_ACTIONS, apply, apply_batch, auto_resolve
+from monopoly.fragments import FragmentCache
+from monopoly.game import Game
+from monopoly.server import Board, BoardCatalog, GameServer, LocalBoard
+from monopoly.state import StateUpdater
+from monopoly.store import MemoryStore
+from monopoly.summary import dumps, summarize
+from monopoly.view import View
+
+
+ALIASES = {'unmortgage': 'liftMortgage'}
+
+ARGUMENTS = {'endAuction': 'article'}
+
+
+class AsyncGameServer:
+    ''' GameServer for a single event loop: actions on a game wait on an asyncio lock instead of a thread lock '''
+    def __init__(self, server: GameServer):
+        self.server = server
+        self.locks = weakref.WeakValueDictionary()
+
+    def lock(self, id: int) -> asyncio.Lock:
+        lock = self.locks.get(id)
+        if lock is None:
+            lock = self.locks[id] = asyncio.Lock()
+        return lock
+
+    def exists(self, id: int) -> bool:
+        return self.server.exists(id)
+
+    @property
+    def epoch(self) -> str:
+        return self.server.epoch
+
+    def version(self, id: int) -> int | None:
+        return self.server.version(id)
+
+    def get(self, id: int):
+        return self.server.get(id)
+
+    async def create(self) -> int:
+        return await asyncio.to_thread(self.server.create)
+
+    @asynccontextmanager
+    async def read(self, id: int):
+        async with self.lock(id):
+            yield self.server.get(id)
+
+    @asynccontextmanager
+    async def checkout(self, id: int):
+        async with self.lock(id):
+            with self.server.store.checkout(id) as state:
+                yield Game(state, StateUpdater(state)), state
+
+
+def parse(name: str, position: str | None, values: dict) -> dict:
+    action = {'action': ALIASES.get(name, name)}
+    for key, value in values.items():
+        action[key] = int(value) if value.lstrip('-').isdigit() else value
+    if position is not None:
+        action[ARGUMENTS.get(name, 'position')] = int(position)
+    if 'price' in action and name == 'bid':
+        action['amount'] = action.pop('price')
+    return action
+
+
+def configure_async_routing(app: Quart, server: AsyncGameServer, fragments: FragmentCache | None=None, broadcaster: Broadcaster | None=None, keepalive: float=15):
+    fragments = fragments or FragmentCache()
+    broadcaster = broadcaster or Broadcaster()
+    app.jinja_env.globals['fragment'] = fragments.render_async
+
+    def wants_json():
+        return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+    async def respond(id, state, action, html, status=200, **extra):
+        if wants_json():
+            document = {'action': action, 'state': summarize(id, state), **extra}
+            return app.response_class(dumps(document), status=status, mimetype='application/json')
+        return await html()
+
+    async def publish(id, state, action):
+        async def render():
+            return message('state', await render_template('partials/state.html', **View.create(id, state, action)))
+        await broadcaster.publish_async(id, render)
+
+    @app.get('/')
+    async def create():
+        game = await server.create()
+        if not wants_json():
+            return redirect(url_for('join', id=game))
+
+        _, state = server.get(game)
+        response = await respond(game, state, actions.roll(), None, status=201)
+        response.headers['Location'] = url_for('join', id=game)
+        return response
+
+    def conditional(func):
+        @wraps(func)
+        async def inner(id, *args, **kwargs):
+            version = server.version(id)
+            if version is None:
+                return await func(id, *args, **kwargs)
+
+            etag = f'{server.epoch}-{id}-{version}' + ('-json' if wants_json() else '')
+            if etag in request.if_none_match:
+                response = await make_response('', 304)
+            else:
+                response = await make_response(await func(id, *args, **kwargs))
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Accept')
+            return response
+
+        return inner
+
+    @app.get('/<int:id>')
+    @conditional
+    async def join(id):
+        if not server.exists(id):
+            return ({'error': 'Game not found'}, 404) if wants_json() else redirect(url_for('create'))
+
+        async with server.read(id) as (_, state):
+            action = state.action or actions.roll()
+            html = lambda: render_template('index.html', **View.create(id, state, action))
+            return await respond(id, state, action, html)
+
+    @app.get('/<int:id>/properties/<int:property>')
+    @conditional
+    async def get_property(id, property):
+        async with server.read(id) as (game, state):
+            action = game.use_property(property)
+            html = lambda: render_template('partials/property.html', **View.create(id, state, action))
+            return await respond(id, state, action, html)
+
+    @app.get('/<int:id>/events')
+    async def events(id):
+        if not server.exists(id):
+            return 'Game not found', 404
+
+        async def stream():
+            subscription = broadcaster.subscribe(id, AsyncSubscription)
+            try:
+                yield ': connected\n\n'
+                while True:
+                    yield await subscription.get(keepalive) or ': keepalive\n\n'
+            finally:
+                broadcaster.unsubscribe(id, subscription)
+
+        response = await make_response(stream(), {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        response.mimetype = 'text/event-stream'
+        response.timeout = None
+        return response
+
+    @app.post('/<int:id>/<name>')
+    @app.post('/<int:id>/<name>/<int:position>')
+    async def act(id, name, position=None):
+        action = parse(name, position, {**request.args, **await request.form})
+        if action['action'] not in STATE_ACTIONS | AUCTION_ACTIONS | PROPERTY_ACTIONS:
+            return 'Unknown action', 404
+
+        async with server.checkout(id) as (game, state):
+            next_action, steps = apply(game, action), []
+            if action['action'] in STATE_ACTIONS:
+                steps, next_action = auto_resolve(game, next_action)
+            await publish(id, state, next_action)
+
+            view = lambda: View.create(id, state, next_action, steps)
+            if action['action'] in PROPERTY_ACTIONS:
+                render = lambda: render_template('partials/view/players.html', **view())
+                html = lambda: fragments.get_async(id, 'partials/view/players.html', state.version, render)
+            elif action['action'] in AUCTION_ACTIONS:
+                html = lambda: render_template('partials/auction.html', **view())
+            else:
+                html = lambda: render_template('partials/state.html', **view())
+            return await respond(id, state, next_action, html, steps=steps)
+
+    @app.post('/<int:id>/batch')
+    async def batch(id):
+        body = await request.get_json(silent=True)
+        batch = body.get('actions') if isinstance(body, dict) else body
+        if not isinstance(batch, list) or not all(isinstance(action, dict) and 'action' in action for action in batch):
+            return {'error': 'Expected a list of actions'}, 400
+
+        async with server.checkout(id) as (game, state):
+            try:
+                applied, pending = apply_batch(game, batch)
+            except (KeyError, IndexError, TypeError, ValueError) as error:
+                return {'error': f'Batch rolled back: {error!r}'}, 400
+
+            steps, pending = auto_resolve(game, pending)
+            await publish(id, state, pending)
+            html = lambda: render_template('partials/state.html', **View.create(id, state, pending, steps))
+            return await respond(id, state, pending, html, applied=applied, steps=steps)
+
+    @app.post('/<int:id>/auto')
+    async def auto(id):
+        enabled = request.args.get('enabled', 'true')
+        async with server.checkout(id) as (game, state):
+            game.updater.set_auto(enabled.lower() not in ('0', 'false', 'off'))
+            steps, pending = auto_resolve(game, state.action or actions.roll())
+            await publish(id, state, pending)
+            html = lambda: render_template('partials/state.html', **View.create(id, state, pending, steps))
+            return await respond(id, state, pending, html, steps=steps)
+
+    @app.post('/<int:id>/auction/<int:property>')
+    async def auction(id, property):
+        return await act(id, 'auction', property)
+
+    @app.post('/<int:id>/leaveJail')
+    async def leave_jail(id):
+        return await act(id, 'leaveJail')
+
+    return app
+
+
+def create_app():
+    ''' Factory for ASGI servers, such as `hypercorn 'asgi:create_app()'` '''
+    app = Quart(__name__)
+    path = os.environ.get('MONOPOLY_BOARD')
+    source = LocalBoard(path) if path else Board(3000)
+    board = BoardCatalog(source, ttl=float(os.environ.get('MONOPOLY_BOARD_TTL', 60)))
+    server = AsyncGameServer(GameServer(board, MemoryStore()))
+    fragments = FragmentCache(int(os.environ.get('MONOPOLY_FRAGMENTS', 1000)))
+    return configure_async_routing(app, server, fragments)
@@ -0,0 +1,162 @@
+import random
+import sys
+import threading
+from collections import Counter, defaultdict
+from typing import NamedTuple
+from monopoly.engine import options
+
+
+IN_PATH = {'goTo', 'passGo', 'jump', 'buy', 'rent', 'mortgage', 'liftMortgage', 'develop', 'demolish', 'auction'}
+
+ROUTES = {'liftMortgage': 'unmortgage'}
+
+MANAGE = ['liftMortgage', 'develop', 'mortgage', 'demolish']
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: dict
+    form: dict
+    route: str
+    body: list | None = None
+    headers: dict | None = None
+
+
+def request_for(game: int, action: dict) -> Request:
+    ''' The request a page would send for an action dict, labelled with its route '''
+    name = action['action']
+    route = f'/<id>/{ROUTES.get(name, name)}'
+    query, form = {}, {}
+    if name in IN_PATH:
+        route += '/<position>'
+    elif name == 'endAuction':
+        route += '/<article>'
+
+    for key in ('amount', 'price', 'position'):
+        if action.get(key) is not None and not (key == 'position' and name in IN_PATH):
+            query[key] = action[key]
+    if action.get('interrupt'):
+        query['interrupt'] = 1
+    if name == 'bid':
+        form['price'] = query.pop('price')
+
+    path = route.replace('<id>', str(game)).replace('<position>', str(action.get('position'))).replace('<article>', str(action.get('article')))
+    return Request('POST', path, query, form, f'POST {route}')
+
+
+def percentiles(samples: list[float], points=(50, 95, 99)) -> dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {f'p{point}': 0.0 for point in points}
+    return {f'p{point}': ordered[min(len(ordered) - 1, len(ordered) * point // 100)] for point in points}
+
+
+class Player:
+    ''' Plays one game over HTTP, following the action dicts each JSON response returns '''
+    def __init__(self, send, rng=random, manage: float=0.1, poll: float=0.05, batch: float=0.05):
+        self.send = send
+        self.rng = rng
+        self.rates = {'manage': manage, 'poll': poll, 'batch': batch}
+        self.game = None
+        self.pending = None
+        self.state = None
+        self.etag = None
+
+    def update(self, status: int, body: dict | None):
+        if status < 400 and body is not None:
+            self.pending, self.state = body['action'], body['state']
+
+    def create(self, auto: bool=False) -> bool:
+        ''' Start a game, returning False if the server could not create one '''
+        status, body, _ = self.send(Request('GET', '/', {}, {}, 'GET /'))
+        self.update(status, body)
+        if self.state is None:
+            return False
+
+        self.game = self.state['game']
+        if auto:
+            self.update(*self.send(Request('POST', f'/{self.game}/auto', {}, {}, 'POST /<id>/auto'))[:2])
+        return True
+
+    def choose(self, offered: list[dict]) -> dict:
+        names = [option['action'] for option in offered]
+        cash = self.state['players'][self.state['player']]['cash']
+        if 'bid' in names:
+            amount = (self.state['auction'] or {}).get('amount', 0) + 10
+            if amount < cash and self.rng.random() < 0.3:
+                return {'action': 'bid', 'price': amount}
+            return offered[names.index('stay')]
+        if 'buy' in names and offered[names.index('buy')].get('price', 0) <= cash:
+            return offered[names.index('buy')]
+        return self.rng.choice(offered)
+
+    def step(self):
+        owned = [property['position'] for property in self.state['properties'] if property['owner'] == self.state['player']]
+        if owned and self.rng.random() < self.rates['manage']:
+            return self.manage(self.rng.choice(owned))
+        if self.rng.random() < self.rates['poll']:
+            return self.poll()
+
+        action = self.choose(options(self.pending))
+        if action['action'] != 'bid' and self.rng.random() < self.rates['batch']:
+            status, body, _ = self.send(Request('POST', f'/{self.game}/batch', {}, {}, 'POST /<id>/batch', body=[action]))
+        else:
+            status, body, _ = self.send(request_for(self.game, action))
+        self.update(status, body)
+
+    def manage(self, position: int):
+        status, body, _ = self.send(Request('GET', f'/{self.game}/properties/{position}', {}, {}, 'GET /<id>/properties/<property>'))
+        if status >= 400:
+            return
+
+        cash = self.state['players'][self.state['player']]['cash']
+        wanted = 'mortgage' if cash < 0 else self.rng.choice(MANAGE)
+        for option in options(body['action']):
+            if option['action'] == wanted:
+                self.update(*self.send(request_for(self.game, option))[:2])
+                return
+
+    def poll(self):
+        headers = {'If-None-Match': self.etag} if self.etag else {}
+        status, _, etag = self.send(Request('GET', f'/{self.game}', {}, {}, 'GET /<id>', headers=headers))
+        self.etag = etag or self.etag
+
+
+class Recorder:
+    ''' Latencies and error counts per route, safe to share between threads '''
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.guard = threading.Lock()
+
+    def record(self, route: str, seconds: float, status: int):
+        with self.guard:
+            self.samples[route].append(seconds)
+            if status >= 400:
+                self.errors[route] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            latency = {key: round(1e3 * value, 3) for key, value in percentiles(samples).items()}
+            routes[route] = {
+                'requests': len(samples),
+                'errors': self.errors[route],
+                'errorRate': self.errors[route] / len(samples),
+                'rps': len(samples) / elapsed,
+                'meanMs': round(1e3 * sum(samples) / len(samples), 3),
+                **{f'{key}Ms': value for key, value in latency.items()},
+                'maxMs': round(1e3 * max(samples), 3)
+            }
+
+        requests = sum(route['requests'] for route in routes.values())
+        errors = sum(route['errors'] for route in routes.values())
+        return {'elapsed': elapsed, 'requests': requests, 'rps': requests / elapsed, 'errorRate': errors / max(1, requests), 'routes': routes}
+
+
+def print_report(report: dict, file=sys.stdout):
+    print(f'{report["requests"]} requests in {report["elapsed"]:.2f}s, {report["rps"]:.0f} req/s, {100 * report["errorRate"]:.2f}% errors', file=file)
+    print(f'{"route":40} {"count":>7} {"err%":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}', file=file)
+    for route, stats in report['routes'].items():
+        print(f'{route:40} {stats["requests"]:7} {100 * stats["errorRate"]:6.2f} {stats["p50Ms"]:8.3f} {stats["p95Ms"]:8.3f} {stats["p99Ms"]:8.3f}', file=file)
@@ -0,0 +1,201 @@
+import argparse
+import copy
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from dataclasses import asdict
+from monopoly import actions
+from monopoly.codec import Codec
+from monopoly.engine import Engine, GreedyStrategy, RandomStrategy
+from monopoly.game import Game
+from monopoly.server import BoardCatalog, GameServer, LocalBoard
+from monopoly.state import StateUpdater
+from monopoly.view import View
+
+
+BOARD = BoardCatalog(LocalBoard(), ttl=float('inf'))
+
+
+def owned_game():
+    server = GameServer(BOARD)
+    _, state = server.get(server.create())
+    updater = StateUpdater(state)
+
+    updater.set_player(1)
+    for position, property in enumerate(state.board):
+        if 'price' in property and 'rent' in property:
+            updater.acquire_property(position)
+    updater.set_player(0)
+
+    return Game(state, updater, random.Random(0)), state
+
+
+def bench_roll(game, state):
+    return game.roll, 1
+
+
+def bench_go_to(game, state):
+    positions = range(len(state.board))
+    def run():
+        for position in positions:
+            game.go_to(position)
+    return run, len(positions)
+
+
+def bench_use_property(game, state):
+    positions = [i for i, property in enumerate(state.board) if 'owner' in property]
+    def run():
+        for position in positions:
+            game.use_property(position)
+    return run, len(positions)
+
+
+def bench_auction(game, state):
+    ''' Auction with one bid and a stay from every player, then cleared so it can start again '''
+    position = next(i for i, property in enumerate(state.board) if 'price' in property)
+    def run():
+        game.auction(position, False)
+        game.bid(10)
+        for _ in state.players:
+            game.stay()
+        game.pass_auction()
+    return run, 1
+
+
+def bench_view_create(game, state):
+    action = actions.roll()
+    def run():
+        view = View.create(0, state, action)['state']
+        for player in range(len(state.players)):
+            view.owns_property(player)
+            view.get_holdings(player)
+    return run, 1
+
+
+def to_json(state) -> str:
+    return json.dumps({
+        'board': state.board,
+        'sets': state.sets,
+        'decks': {name: [state.cards[card] for card in deck] for name, deck in state.decks.items()},
+        'players': [{**asdict(player), 'cards': [state.cards[card] for card in player.cards]} for player in state.players],
+        'player': state.player,
+        'started': state.started,
+        'roll': state.roll,
+        'restore': state.restore,
+        'auction': state.auction,
+        'action': state.action
+    })
+
+
+def bench_encode(game, state):
+    codec = Codec(BOARD)
+    return lambda: codec.encode(state), 1
+
+
+def bench_decode(game, state):
+    codec = Codec(BOARD)
+    data = codec.encode(state)
+    return lambda: codec.decode(data), 1
+
+
+def bench_json_dumps(game, state):
+    return lambda: to_json(state), 1
+
+
+def bench_json_loads(game, state):
+    data = to_json(state)
+    return lambda: json.loads(data), 1
+
+
+def bench_fork(game, state):
+    def run():
+        forked = state.fork()
+        StateUpdater(forked).pay_bank(10)
+    return run, 1
+
+
+def bench_deepcopy(game, state):
+    def run():
+        copied = copy.deepcopy(state)
+        StateUpdater(copied).pay_bank(10)
+    return run, 1
+
+
+BENCHMARKS = {
+    'Game.roll': bench_roll,
+    'Game.go_to': bench_go_to,
+    'Game.use_property': bench_use_property,
+    'Game.auction': bench_auction,
+    'View.create': bench_view_create,
+    'Codec.encode': bench_encode,
+    'Codec.decode': bench_decode,
+    'json.dumps': bench_json_dumps,
+    'json.loads': bench_json_loads,
+    'GameState.fork': bench_fork,
+    'copy.deepcopy': bench_deepcopy
+}
+
+
+GAMES = {
+    'Engine.play greedy': GreedyStrategy,
+    'Engine.play random': RandomStrategy
+}
+
+
+def play_games(name: str, games: int, seed: int=0) -> dict:
+    ''' Whole seeded games between three players of one strategy '''
+    engine = Engine(BOARD, [GAMES[name]() for _ in range(3)])
+    start = time.perf_counter()
+    results = [engine.play(seed + game) for game in range(games)]
+    elapsed = time.perf_counter() - start
+    played = sum(result.actions for result in results)
+    return {'name': name, 'unit': 'games/s', 'best': games / elapsed, 'games': games, 'actionsPerGame': played / games, 'actionsPerSecond': played / elapsed}
+
+
+def environment() -> dict:
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def measure(number: int=200, repeat: int=5, only: list[str] | None=None, games: int=200) -> list[dict]:
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        run, calls = bench(*owned_game())
+        times = [1e6 * total / (number * calls) for total in timeit.repeat(run, number=number, repeat=repeat)]
+        results.append({'name': name, 'unit': 'us/call', 'best': min(times), 'median': sorted(times)[len(times) // 2], 'calls': number * calls, 'repeat': repeat})
+
+    for name in GAMES:
+        if games and (not only or name in only):
+            results.append(play_games(name, games))
+
+    _, state = owned_game()
+    results.append({'name': 'Codec size', 'unit': 'bytes', 'best': len(Codec(BOARD).encode(state))})
+    results.append({'name': 'JSON size', 'unit': 'bytes', 'best': len(to_json(state))})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the game engine, state copies and encodings')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS | GAMES))
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--games', type=int, default=200, help='whole games to play for each strategy, 0 to skip')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    results = measure(args.number, args.repeat, args.only, args.games)
+    if args.format == 'json':
+        json.dump({**environment(), 'results': results}, sys.stdout, indent=2)
+        return
+
+    for result in results:
+        value = f'{result["best"]:8.2f}' if isinstance(result['best'], float) else f'{result["best"]:8}'
+        print(f'{result["name"]:24} {value} {result["unit"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import http.client
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+from werkzeug.serving import make_server
+from benchmarks.client import Player, Recorder, print_report
+from benchmarks.game import environment
+from benchmarks.routes import new_app
+
+
+def http_transport(url: str, recorder: Recorder):
+    ''' Sends requests over one keep-alive connection per thread '''
+    address = urlsplit(url)
+    local = threading.local()
+
+    def connection():
+        if getattr(local, 'connection', None) is None:
+            local.connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+        return local.connection
+
+    def send(request):
+        path = request.path + ('?' + urlencode(request.query) if request.query else '')
+        headers = {'Accept': 'application/json', **(request.headers or {})}
+        body = None
+        if request.body is not None:
+            body, headers['Content-Type'] = json.dumps(request.body), 'application/json'
+        elif request.form:
+            body, headers['Content-Type'] = urlencode(request.form), 'application/x-www-form-urlencoded'
+
+        start = time.perf_counter()
+        try:
+            conn = connection()
+            conn.request(request.method, path, body, headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            local.connection = None
+            recorder.record(request.route, time.perf_counter() - start, 599)
+            return 599, None, None
+        recorder.record(request.route, time.perf_counter() - start, response.status)
+
+        document = json.loads(data) if response.status != 304 and response.getheader('Content-Type', '').startswith('application/json') else None
+        return response.status, document, response.getheader('ETag')
+
+    return send
+
+
+def drive(players: list[Player], workers: int, duration: float):
+    ''' Step games from a shared queue so each game has at most one request in flight '''
+    ready = queue.SimpleQueue()
+    for player in players:
+        ready.put(player)
+    deadline = time.perf_counter() + duration
+
+    def work():
+        while time.perf_counter() < deadline:
+            player = ready.get()
+            try:
+                player.step()
+            finally:
+                ready.put(player)
+
+    with ThreadPoolExecutor(workers) as executor:
+        for future in [executor.submit(work) for _ in range(workers)]:
+            future.result()
+
+
+def run(url: str, games: int, workers: int | None, duration: float, seed: int=0, auto: bool=False) -> dict:
+    ''' Create games, then play them for a while; games the server fails to create are counted and left out '''
+    workers = min(workers or games, games)
+    setup, recorder = Recorder(), Recorder()
+    players = [Player(http_transport(url, setup), random.Random(seed + game)) for game in range(games)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        created = list(executor.map(lambda player: player.create(auto), players))
+    setup_report = setup.report(time.perf_counter() - start)
+
+    players = [player for player, ok in zip(players, created) if ok]
+    send = http_transport(url, recorder)
+    for player in players:
+        player.send = send
+
+    start = time.perf_counter()
+    if players:
+        drive(players, min(workers, len(players)), duration)
+    return {
+        'games': len(players),
+        'failed': games - len(players),
+        'workers': min(workers, len(players)),
+        'setup': setup_report,
+        **recorder.report(time.perf_counter() - start)
+    }
+
+
+def serve(store: str):
+    ''' The API on a free local port, with the bundled board so no board server is needed '''
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, new_app(store), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Drive many concurrent games and report throughput and latency per route')
+    parser.add_argument('--games', type=int, nargs='+', default=[1, 10, 100, 1000], help='concurrent games for each run')
+    parser.add_argument('--workers', type=int, help='client threads, each with one request in flight, one per game by default')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--auto', action='store_true', help='resolve forced actions on the server')
+    parser.add_argument('--url', help='running server to drive instead of a local one')
+    parser.add_argument('--store', choices=['memory', 'sqlite'], default='memory')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    server, url = serve(args.store) if args.url is None else (None, args.url)
+    try:
+        runs = []
+        for games in args.games:
+            runs.append(run(url, games, args.workers, args.duration, args.seed, args.auto))
+            if args.format == 'text':
+                report = runs[-1]
+                print(f'\n{games} games, {report["failed"]} failed to start, at most {report["workers"]} requests in flight')
+                print('Creating games:')
+                print_report(report['setup'])
+                print('Playing:')
+                print_report(report)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.format == 'json':
+        json.dump({**environment(), 'url': url, 'duration': args.duration, 'runs': runs}, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from flask import Flask
+from api import configure_routing
+from benchmarks.client import Player, Recorder, Request, print_report, request_for
+from benchmarks.game import environment
+from monopoly import actions
+from monopoly.engine import options
+from monopoly.server import BoardCatalog, GameServer, LocalBoard
+from monopoly.store import MemoryStore, SqliteStore
+
+
+ACCEPT = {'json': 'application/json', 'html': 'text/html'}
+
+TOUR = [
+    {'action': 'collect', 'amount': 10}, actions.pay(10),
+    {'action': 'payEachPlayer', 'amount': 10}, {'action': 'collectFromEachPlayer', 'amount': 10},
+    actions.pass_go(0), {'action': 'jump', 'position': 5},
+    actions.buy_property(1, 60), actions.buy_property(3, 60), actions.pay_rent(1, 2),
+    actions.develop(1, 50), actions.demolish(1, 25), actions.mortgage(3, 30), actions.lift_mortgage(3, 33),
+    actions.auction(6, False), {'action': 'bid', 'price': 10}, actions.stay(), actions.stay(), actions.stay(),
+    {'action': 'endAuction', 'article': 6},
+    actions.go_to_jail(), actions.use_card(), actions.go_to_jail(), actions.serve_time(), actions.leave_jail(None, 50),
+    actions.end_turn()
+]
+
+
+def new_app(store: str='memory') -> Flask:
+    ''' The API against the bundled board, so runs need no board server '''
+    store = SqliteStore(os.path.join(tempfile.mkdtemp(), 'games.db')) if store == 'sqlite' else MemoryStore()
+    app = Flask('api')
+    return configure_routing(app, GameServer(BoardCatalog(LocalBoard()), store))
+
+
+def flask_transport(app: Flask, recorder: Recorder, accept: str=ACCEPT['json'], log: list | None=None):
+    ''' Sends requests through the test client, revalidating with the ETags this app handed out '''
+    client = app.test_client()
+    etags = {}
+
+    def send(request):
+        headers = {'Accept': accept, **(request.headers or {})}
+        if 'If-None-Match' in headers and request.path in etags:
+            headers['If-None-Match'] = etags[request.path]
+        start = time.perf_counter()
+        response = client.open(request.path, method=request.method, query_string=request.query, data=request.form or None, json=request.body, headers=headers)
+        recorder.record(request.route, time.perf_counter() - start, response.status_code)
+
+        if log is not None:
+            log.append(request)
+        if response.headers.get('ETag'):
+            etags[request.path] = response.headers['ETag']
+        body = response.get_json(silent=True) if response.status_code != 304 else None
+        return response.status_code, body, response.headers.get('ETag')
+
+    return send
+
+
+def tour(send):
+    ''' One request to every route, in an order the game accepts, so none is left to chance '''
+    _, body, _ = send(Request('GET', '/', {}, {}, 'GET /'))
+    game = body['state']['game']
+    send(request_for(game, actions.roll()))
+    send(request_for(game, actions.go_to(7)))
+    for _ in range(32):
+        _, body, _ = send(request_for(game, actions.draw_card()))
+        offered = options(body['action'])
+        if offered[0]['action'] == 'collectCard':
+            send(request_for(game, offered[0]))
+            break
+
+    for action in TOUR:
+        send(request_for(game, action))
+
+    send(Request('GET', f'/{game}', {}, {}, 'GET /<id>'))
+    send(Request('GET', f'/{game}/properties/1', {}, {}, 'GET /<id>/properties/<property>'))
+    send(Request('POST', f'/{game}/batch', {}, {}, 'POST /<id>/batch', body=[actions.roll()]))
+    send(Request('POST', f'/{game}/auto', {}, {}, 'POST /<id>/auto'))
+
+
+def record(games: int, steps: int, seed: int, store: str) -> list[Request]:
+    ''' The requests of seeded games played round robin, following the actions each JSON response offers '''
+    random.seed(seed)
+    log = []
+    send = flask_transport(new_app(store), Recorder(), log=log)
+
+    players = [Player(send, random.Random(seed + game)) for game in range(games)]
+    for game, player in enumerate(players):
+        player.create(auto=game % 2 == 1)
+    for _ in range(steps):
+        for player in players:
+            player.step()
+    tour(send)
+    return log
+
+
+def replay(requests: list[Request], accept: str, seed: int, store: str) -> dict:
+    ''' Time the recorded requests against a fresh app, seeded so games play out as recorded '''
+    random.seed(seed)
+    recorder = Recorder()
+    send = flask_transport(new_app(store), recorder, accept)
+
+    start = time.perf_counter()
+    for request in requests:
+        send(request)
+    return recorder.report(time.perf_counter() - start)
+
+
+def run(games: int=20, steps: int=200, seed: int=0, store: str='memory', modes=('json', 'html')) -> dict:
+    requests = record(games, steps, seed, store)
+    return {mode: replay(requests, ACCEPT[mode], seed, store) for mode in modes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time every API route end to end through the Flask test client')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--store', choices=['memory', 'sqlite'], default='memory')
+    parser.add_argument('--mode', action='append', choices=sorted(ACCEPT), help='responses to time, JSON and HTML by default')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    reports = run(args.games, args.steps, args.seed, args.store, args.mode or ('json', 'html'))
+    if args.format == 'json':
+        json.dump({**environment(), 'games': args.games, 'steps': args.steps, 'seed': args.seed, 'store': args.store, 'modes': reports}, sys.stdout, indent=2)
+        return
+
+    for mode, report in reports.items():
+        print(f'\n{mode.upper()} responses')
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
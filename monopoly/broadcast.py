@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from collections import Counter, defaultdict, deque
+
+
+def message(event: str, data: str) -> str:
+    lines = ''.join(f'data: {line}\n' for line in data.splitlines())
+    return f'event: {event}\n{lines}\n'
+
+
+class Subscription:
+    def __init__(self, size: int):
+        self.messages = deque(maxlen=size)
+        self.ready = threading.Condition()
+        self.dropped = 0
+
+    def put(self, message: str):
+        with self.ready:
+            if len(self.messages) == self.messages.maxlen:
+                self.dropped += 1
+            self.messages.append(message)
+            self.ready.notify()
+
+    def get(self, timeout: float | None=None) -> str | None:
+        with self.ready:
+            if not self.messages:
+                self.ready.wait(timeout)
+            return self.messages.popleft() if self.messages else None
+
+
+class AsyncSubscription:
+    def __init__(self, size: int):
+        self.messages = deque(maxlen=size)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, message: str):
+        if len(self.messages) == self.messages.maxlen:
+            self.dropped += 1
+        self.messages.append(message)
+        self.ready.set()
+
+    async def get(self, timeout: float | None=None) -> str | None:
+        if not self.messages:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.messages.popleft()
+
+
+class Broadcaster:
+    ''' Fans one rendered message out to every subscriber of a game, dropping the oldest for slow subscribers '''
+    def __init__(self, size: int=8):
+        self.size = size
+        self.subscribers = defaultdict(set)
+        self.guard = threading.Lock()
+        self.stats = Counter()
+
+    def subscribe(self, game: int, kind=Subscription) -> Subscription | AsyncSubscription:
+        subscription = kind(self.size)
+        with self.guard:
+            self.subscribers[game].add(subscription)
+        return subscription
+
+    def unsubscribe(self, game: int, subscription: Subscription):
+        with self.guard:
+            self.subscribers[game].discard(subscription)
+            if not self.subscribers[game]:
+                del self.subscribers[game]
+
+    def subscribers_of(self, game: int) -> list:
+        with self.guard:
+            return list(self.subscribers.get(game, []))
+
+    def fan_out(self, subscribers: list, message: str):
+        self.stats['renders'] += 1
+        for subscription in subscribers:
+            subscription.put(message)
+        self.stats['messages'] += len(subscribers)
+
+    def publish(self, game: int, render):
+        subscribers = self.subscribers_of(game)
+        if subscribers:
+            self.fan_out(subscribers, render())
+
+    async def publish_async(self, game: int, render):
+        subscribers = self.subscribers_of(game)
+        if subscribers:
+            self.fan_out(subscribers, await render())
@@ -0,0 +1,100 @@
+import json
+import zlib
+from collections import deque
+from struct import Struct
+from monopoly.model import Player
+from monopoly.state import GameState
+
+
+FORMAT = 3
+
+HEADER = Struct('<BIIBB??BBB')
+SQUARE = Struct('<bbB')
+PLAYER = Struct('<iBbbB')
+
+MORTGAGED, IS_MORTGAGED, ENCUMBERED, IS_ENCUMBERED, HOUSES = (1 << i for i in range(5))
+
+
+class Codec:
+    ''' Packs the changing parts of a GameState into fixed-width records, referring to the static board by id '''
+    def __init__(self, board):
+        self.properties = board.get_properties()
+        self.sets = board.get_sets()
+        self.cards = board.get_cards()
+        self.board_id = zlib.crc32(json.dumps([self.properties, self.sets, self.cards.cards], sort_keys=True).encode())
+
+    def encode(self, state: GameState) -> bytes:
+        a, b = state.roll or (0, 0)
+        chunks = [HEADER.pack(FORMAT, self.board_id, state.version, len(state.players), state.player, state.started, state.auto, a, b, len(state.board))]
+
+        for property in state.board:
+            flags = HOUSES if 'houses' in property else 0
+            if 'mortgaged' in property:
+                flags |= MORTGAGED | (IS_MORTGAGED if property['mortgaged'] else 0)
+            if 'encumbered' in property:
+                flags |= ENCUMBERED | (IS_ENCUMBERED if property['encumbered'] else 0)
+            owner = property.get('owner')
+            chunks.append(SQUARE.pack(-1 if owner is None else owner, property.get('houses', 0), flags))
+
+        for player in state.players:
+            chunks.append(PLAYER.pack(player.cash, player.position, player.in_jail, player.doubles, len(player.cards)))
+            chunks.append(bytes(player.cards))
+
+        for name in self.cards.ids:
+            deck = state.decks[name]
+            chunks.append(bytes([len(deck)]))
+            chunks.append(bytes(deck))
+
+        if state.action is not None or state.restore is not None or state.auction is not None:
+            chunks.append(json.dumps([state.action, state.restore, state.auction], separators=(',', ':')).encode())
+        return b''.join(chunks)
+
+    def decode(self, data: bytes) -> GameState:
+        format, board_id, version, players, player, started, auto, a, b, size = HEADER.unpack_from(data)
+        if format != FORMAT or board_id != self.board_id:
+            raise ValueError(f'Game was encoded for board {board_id}, not {self.board_id}')
+        offset = HEADER.size
+
+        board = []
+        for property, (owner, houses, flags) in zip(self.properties, SQUARE.iter_unpack(data[offset:offset + size * SQUARE.size])):
+            square = dict(property)
+            if owner >= 0:
+                square['owner'] = owner
+            if flags & HOUSES:
+                square['houses'] = houses
+            if flags & MORTGAGED:
+                square['mortgaged'] = bool(flags & IS_MORTGAGED)
+            if flags & ENCUMBERED:
+                square['encumbered'] = bool(flags & IS_ENCUMBERED)
+            board.append(square)
+        offset += size * SQUARE.size
+
+        seats = []
+        for _ in range(players):
+            cash, position, in_jail, doubles, count = PLAYER.unpack_from(data, offset)
+            offset += PLAYER.size
+            seats.append(Player(cash, position, in_jail, doubles, list(data[offset:offset + count])))
+            offset += count
+
+        decks = {}
+        for name in self.cards.ids:
+            length = data[offset]
+            decks[name] = deque(data[offset + 1:offset + 1 + length])
+            offset += 1 + length
+
+        action, restore, auction = json.loads(data[offset:]) if offset < len(data) else (None, None, None)
+        return GameState(
+            board=board,
+            sets=self.sets,
+            decks=decks,
+            players=seats,
+            player=player,
+            started=started,
+            auto=auto,
+            roll=(a, b) if a else 0,
+            restore=restore,
+            auction=auction,
+            action=action,
+            cards=self.cards.cards,
+            version=version
+        )
@@ -0,0 +1,35 @@
+import random
+import threading
+from collections import deque
+
+
+class CardTable:
+    ''' Every card on the board in one list, so decks and hands can hold card ids '''
+    def __init__(self, decks: dict[str, list[dict]], batch: int=0):
+        self.cards = []
+        self.ids = {}
+        for name, cards in decks.items():
+            self.ids[name] = range(len(self.cards), len(self.cards) + len(cards))
+            self.cards += cards
+
+        self.batch = batch
+        self.pool = deque()
+        self.guard = threading.Lock()
+
+    def shuffle(self, rng=random) -> dict[str, deque]:
+        return {name: deque(rng.sample(ids, len(ids))) for name, ids in self.ids.items()}
+
+    def shuffle_many(self, count: int, rng=random) -> list[dict[str, deque]]:
+        return [self.shuffle(rng) for _ in range(count)]
+
+    def deal(self, rng=random) -> dict[str, deque]:
+        ''' Shuffled decks, taken from a pre-shuffled pool when the table has one and no seeded generator is given '''
+        if rng is not random or not self.batch:
+            return self.shuffle(rng)
+        while True:
+            try:
+                return self.pool.popleft()
+            except IndexError:
+                with self.guard:
+                    if not self.pool:
+                        self.pool.extend(self.shuffle_many(self.batch))
@@ -0,0 +1,245 @@
+import random
+from dataclasses import dataclass, field
+from monopoly import actions
+from monopoly.game import Game, get_auction, get_player
+from monopoly.model import Auction, PropertyType
+from monopoly.server import BoardCatalog, Catalog, LocalBoard, new_game
+
+
+STATE_ACTIONS = {
+    'roll': lambda game, action: game.roll(),
+    'goToJail': lambda game, action: game.go_to_jail(),
+    'leaveJail': lambda game, action: game.leave_jail(action.get('position'), action.get('amount')),
+    'useCard': lambda game, action: game.use_card(),
+    'serveTime': lambda game, action: game.serve_time(),
+    'passGo': lambda game, action: game.pass_go(action['position'], action['amount']),
+    'drawCard': lambda game, action: game.draw_card(),
+    'jump': lambda game, action: game.jump(action['position']),
+    'goTo': lambda game, action: game.go_to(action['position']),
+    'buy': lambda game, action: game.buy_property(action['position'], action['price']),
+    'rent': lambda game, action: game.pay_rent(action['position'], action['amount']),
+    'pay': lambda game, action: game.pay_bank(action['amount']),
+    'payEachPlayer': lambda game, action: game.pay_each_player(action['amount']),
+    'collect': lambda game, action: game.pay_bank(-action['amount']),
+    'collectFromEachPlayer': lambda game, action: game.pay_each_player(-action['amount']),
+    'collectCard': lambda game, action: game.collect_card(),
+    'endAuction': lambda game, action: game.end_auction(action['article']),
+    'endTurn': lambda game, action: game.end_turn()
+}
+
+AUCTION_ACTIONS = {
+    'auction': lambda game, action: game.auction(action['position'], bool(action.get('interrupt'))),
+    'bid': lambda game, action: game.bid(action['amount']),
+    'stay': lambda game, action: game.stay()
+}
+
+PROPERTY_ACTIONS = {
+    'mortgage': Game.mortgage,
+    'liftMortgage': Game.lift_mortgage,
+    'develop': Game.develop,
+    'demolish': Game.demolish
+}
+
+FORCED = {'leaveJail', 'goTo', 'passGo', 'jump', 'drawCard', 'goToJail', 'serveTime', 'pay', 'rent', 'collect', 'payEachPlayer', 'collectFromEachPlayer', 'collectCard'}
+
+
+def apply(game: Game, action: dict):
+    ''' Resolve an action dict as the matching route in api.py would, returning the next action '''
+    name = action['action']
+    if name in PROPERTY_ACTIONS:
+        PROPERTY_ACTIONS[name](game, action['position'], action['amount'])
+        return game.state.action
+    if name in AUCTION_ACTIONS:
+        game.updater.set_action(AUCTION_ACTIONS[name](game, action))
+        return game.state.action
+
+    next_action = STATE_ACTIONS[name](game, action)
+    game.updater.set_action(next_action if next_action else game.resume())
+    return game.state.action
+
+
+def resolve_forced(game: Game, pending, limit: int=50) -> tuple[list[dict], dict | list]:
+    ''' Apply actions that offer no choice until a decision is due, returning the steps taken '''
+    steps = []
+    while len(steps) < limit and isinstance(pending, dict) and pending['action'] in FORCED and get_player(game.state).cash >= 0:
+        steps.append(pending)
+        pending = apply(game, pending)
+    return steps, pending
+
+
+def auto_resolve(game: Game, pending) -> tuple[list[dict], dict | list]:
+    ''' Resolve forced actions for games that opted in, leaving the others untouched '''
+    return resolve_forced(game, pending) if game.state.auto else ([], pending)
+
+
+def options(action) -> list[dict]:
+    return action if isinstance(action, list) else [action]
+
+
+def match(action: dict, offered) -> dict | None:
+    for option in options(offered):
+        if option['action'] == action['action'] and all(option[k] == v for k, v in action.items() if option.get(k) is not None):
+            return {**option, **action}
+    return None
+
+
+def apply_batch(game: Game, batch: list[dict]) -> tuple[list[dict], dict | list]:
+    ''' Apply actions in order until one is not on offer, undoing all of them if any fails '''
+    applied, pending = [], game.state.action or actions.roll()
+    with game.transaction():
+        for action in batch:
+            if action['action'] in PROPERTY_ACTIONS:
+                apply(game, action)
+                applied.append(action)
+                continue
+
+            step = match(action, pending)
+            if step is None:
+                break
+            pending = apply(game, step)
+            applied.append(step)
+
+    return applied, pending
+
+
+def developable(state) -> list[int]:
+    index = state.index
+    return [
+        position
+        for set, members in index.members.items()
+        if state.sets[set]['type'] == PropertyType.RESIDENTIAL.value and index.is_full_set_owned(set, state.player)
+        for position in members
+    ]
+
+
+class Strategy:
+    def choose(self, game: Game, options: list[dict]) -> dict:
+        return options[0]
+
+    def bid(self, game: Game, auction: Auction) -> int | None:
+        return None
+
+    def manage(self, game: Game) -> list[dict]:
+        return []
+
+
+class RandomStrategy(Strategy):
+    def choose(self, game: Game, options: list[dict]) -> dict:
+        return game.rng.choice(options)
+
+    def bid(self, game: Game, auction: Auction) -> int | None:
+        value = auction.orders[auction.order]['value']
+        amount = auction.amount + game.rng.randint(1, max(1, value // 4))
+        if amount > min(value, get_player(game.state).cash) or game.rng.random() < 0.5:
+            return None
+        return amount
+
+
+class GreedyStrategy(Strategy):
+    PREFERENCE = ['useCard', 'buy', 'endAuction', 'liftMortgage']
+
+    def choose(self, game: Game, options: list[dict]) -> dict:
+        ranked = sorted(options, key=lambda option: self.rank(option['action']))
+        return ranked[0]
+
+    def rank(self, name: str) -> int:
+        return self.PREFERENCE.index(name) if name in self.PREFERENCE else len(self.PREFERENCE)
+
+    def bid(self, game: Game, auction: Auction) -> int | None:
+        value = auction.orders[auction.order]['value']
+        amount = auction.amount + 10
+        if amount > min(value, get_player(game.state).cash):
+            return None
+        return amount
+
+    def manage(self, game: Game) -> list[dict]:
+        state = game.state
+        cash = get_player(state).cash
+        if 0 <= cash <= 500:
+            return []
+
+        if cash < 0:
+            wanted = 'mortgage'
+            candidates = state.index.owned_by(state.player)
+        else:
+            wanted = 'develop'
+            candidates = developable(state)
+
+        for position in candidates:
+            for option in game.use_property(position):
+                if option['action'] == wanted:
+                    return [option]
+        return []
+
+
+@dataclass
+class Result:
+    seed: int | str | None
+    winner: int
+    turns: int
+    actions: int
+    bankrupt: int | None
+    cash: list[int] = field(default_factory=list)
+
+
+class Engine:
+    def __init__(self, board: Catalog | None=None, strategies: list[Strategy] | None=None, max_turns: int=500):
+        self.board = board or BoardCatalog(LocalBoard(), ttl=float('inf'))
+        self.strategies = strategies or [GreedyStrategy() for _ in range(3)]
+        self.max_turns = max_turns
+
+    def play(self, seed: int | str | None=None) -> Result:
+        rng = random.Random(seed)
+        game, state = new_game(self.board, rng, players=len(self.strategies))
+        pending = state.action = actions.roll()
+        turns, count, stays, bankrupt = 0, 0, 0, None
+
+        while turns < self.max_turns and bankrupt is None:
+            strategy = self.strategies[state.player]
+            choices = options(pending)
+            if choices[0]['action'] == 'bid':
+                action = self.bid(game, strategy)
+                stays = 0 if action['action'] == 'bid' else stays + 1
+                if stays > len(state.players) and get_auction(state).bidder is None:
+                    pending, stays = game.pass_auction(), 0
+                    continue
+            elif len(choices) > 1:
+                action = strategy.choose(game, choices)
+            else:
+                action = choices[0]
+
+            if action['action'] == 'endTurn':
+                count += self.manage(game, strategy)
+                bankrupt = next((i for i, player in enumerate(state.players) if player.cash < 0), None)
+                turns += 1
+
+            pending = apply(game, action)
+            count += 1
+
+        return Result(
+            seed=seed,
+            winner=max(range(len(state.players)), key=lambda i: state.players[i].cash),
+            turns=turns,
+            actions=count,
+            bankrupt=bankrupt,
+            cash=[player.cash for player in state.players]
+        )
+
+    def bid(self, game: Game, strategy: Strategy) -> dict:
+        auction = get_auction(game.state)
+        amount = strategy.bid(game, auction)
+        if amount is None or amount <= auction.amount:
+            return actions.stay()
+        
+        return {**actions.bid(), 'amount': amount}
+
+    def manage(self, game: Game, strategy: Strategy, limit: int=40) -> int:
+        count = 0
+        while count < limit:
+            property_actions = strategy.manage(game)
+            if not property_actions:
+                break
+            for action in property_actions:
+                apply(game, action)
+            count += len(property_actions)
+        return count
@@ -0,0 +1,56 @@
+import threading
+from collections import Counter, OrderedDict
+from jinja2 import pass_context
+from markupsafe import Markup
+
+
+class FragmentCache:
+    ''' Rendered partials keyed by game, template and state version '''
+    def __init__(self, capacity: int=1000):
+        self.capacity = capacity
+        self.fragments = OrderedDict()
+        self.guard = threading.Lock()
+        self.stats = Counter()
+
+    def lookup(self, key: tuple) -> str | None:
+        with self.guard:
+            fragment = self.fragments.get(key)
+            if fragment is not None:
+                self.stats['hits'] += 1
+                self.fragments.move_to_end(key)
+            return fragment
+
+    def keep(self, key: tuple, fragment: str) -> str:
+        self.stats['misses'] += 1
+        with self.guard:
+            self.fragments[key] = fragment
+            while len(self.fragments) > self.capacity:
+                self.fragments.popitem(last=False)
+                self.stats['evictions'] += 1
+        return fragment
+
+    def get(self, game: int, template: str, version: int, render, id: int | None=None) -> str:
+        key = (int(game), template, id, version)
+        fragment = self.lookup(key)
+        return fragment if fragment is not None else self.keep(key, render())
+
+    async def get_async(self, game: int, template: str, version: int, render, id: int | None=None) -> str:
+        key = (int(game), template, id, version)
+        fragment = self.lookup(key)
+        return fragment if fragment is not None else self.keep(key, await render())
+
+    def values(self, context, id: int | None) -> dict:
+        values = context.get_all()
+        if id is not None:
+            values = {**values, 'id': id, 'player': context['state'].get_players()[id]}
+        return values
+
+    @pass_context
+    def render(self, context, template: str, id: int | None=None) -> Markup:
+        render = lambda: context.environment.get_template(template).render(self.values(context, id))
+        return Markup(self.get(context['game'], template, context['state'].state.version, render, id))
+
+    @pass_context
+    async def render_async(self, context, template: str, id: int | None=None) -> Markup:
+        render = lambda: context.environment.get_template(template).render_async(self.values(context, id))
+        return Markup(await self.get_async(context['game'], template, context['state'].state.version, render, id))
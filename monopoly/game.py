@@ -1,11 +1,12 @@
 import random
+from contextlib import contextmanager
 from monopoly import actions
 from monopoly.model import Auction, Player, Property, PropertyType
 from monopoly.state import GameState, StateUpdater
 
 
-def roll_dice():
-    return random.randint(1, 6), random.randint(1, 6)
+def roll_dice(rng=random):
+    return rng.randint(1, 6), rng.randint(1, 6)
 
 
 def get_player(state) -> Player:
@@ -24,10 +25,18 @@ def get_next_order(auction) -> int:
     return (auction.order + 1) % len(auction.orders)
 
 
+def get_card(state, deck) -> dict:
+    return state.cards[state.decks[deck][0]]
+
+
 def get_property(state, position) -> Property:
-    property = state.board[position]
-    set = state.sets[property.get('set', 0)]
-    return Property(**property, **set)
+    view = state.index.views[position]
+    if view is None:
+        property = state.board[position]
+        set = state.sets[property.get('set', 0)]
+        view = state.index.views[position] = Property(**property, **set)
+    
+    return view
 
 
 def can_pass_go(state, destination) -> bool:
@@ -35,14 +44,8 @@ def can_pass_go(state, destination) -> bool:
     return 0 <= destination < player.position
 
 
-def property_set(state, position) -> list[Property]:
-    property = get_property(state, position)
-    properties = (get_property(state, i) for i in range(len(state.board)))
-    return (member for member in properties if member.set == property.set)
-
-
 def is_full_set_owned(state, position, owner):
-    return all(member.owner == owner for member in property_set(state, position))
+    return state.index.is_full_set_owned(state.index.sets[position], owner)
 
 
 def is_purchaseable(property) -> bool:
@@ -59,26 +62,35 @@ def must_leave_jail(player) -> bool:
 
 def find_next(state: GameState, property_type: int) -> int:
     position = get_player(state).position
-    for i in range(len(state.board)):
-        position = (position + i) % len(state.board)
-        if get_property(state, position).type == property_type:
-            break
-
-    return position
+    table = state.index.next.get(property_type)
+    return table[position] if table else position
 
 
 class Game:
-    def __init__(self, state: GameState, updater: StateUpdater):
+    def __init__(self, state: GameState, updater: StateUpdater, rng=random):
         self.state = state
         self.updater = updater
+        self.rng = rng
+
+    def fork(self, rng=None) -> 'Game':
+        state = self.state.fork()
+        return Game(state, StateUpdater(state), rng or self.rng)
+
+    @contextmanager
+    def transaction(self):
+        backup = self.state.fork()
+        try:
+            yield
+        except BaseException:
+            self.state.rollback(backup)
+            raise
 
     def resume(self):
         return self.updater.resume(actions.end_turn())
 
     def roll(self):
-        self.state.started = True
-        
-        self.updater.set_roll(roll_dice())
+        self.updater.start()
+        self.updater.set_roll(roll_dice(self.rng))
 
         a, b = self.state.roll
         doubles, total = a == b, a + b
@@ -140,7 +152,7 @@ class Game:
     def draw_card(self):
         position = get_player(self.state).position
         deck = get_property(self.state, position).name
-        card = self.state.decks[deck][0]
+        card = get_card(self.state, deck)
         if card['action'] != 'collectCard':
             self.updater.swap_card(deck)
         if card['action'] == 'jump':
@@ -197,7 +209,7 @@ class Game:
                 amount = 4 * roll
             return actions.pay_rent(position, amount)
         if type == PropertyType.STATION:
-            level = sum(1 for member in property_set(self.state, position) if member.owner == property.owner) - 1
+            level = self.state.index.count_owned(property.set, property.owner) - 1
             return actions.pay_rent(position, property.rent[level])
             
     def pay_bank(self, amount):
@@ -249,8 +261,8 @@ class Game:
         if PropertyType(property.type) == PropertyType.RESIDENTIAL and is_full_set_owned(self.state, position, property.owner):
             can_afford_building = property.building <= owner.cash
             can_build = property.houses < 5
-            is_least_built = property.houses == min(property.houses for property in property_set(self.state, position))
-            is_mortgage_free = all(not property.mortgaged for property in property_set(self.state, position))
+            is_least_built = property.houses == self.state.index.min_houses(property.set)
+            is_mortgage_free = self.state.index.is_mortgage_free(property.set)
             if can_afford_building and can_build and is_least_built and is_mortgage_free:
                 result = [
                     *result,
@@ -258,7 +270,7 @@ class Game:
                 ]
 
             can_demolish = property.houses > 0
-            is_most_built = property.houses == max(property.houses for property in property_set(self.state, position))
+            is_most_built = property.houses == self.state.index.max_houses(property.set)
             if can_demolish and is_most_built:
                 result = [
                     *result,
@@ -311,6 +323,10 @@ class Game:
 
         return [actions.bid(), actions.stay()]
     
+    def pass_auction(self):
+        self.updater.clear_auction()
+        return self.resume()
+
     def end_auction(self, position):
         bid = get_auction(self.state).amount
         property = get_property(self.state, position)
@@ -333,7 +349,7 @@ class Game:
 
         next_player = get_player(self.state)
         if next_player.in_jail:
-            get_out_of_jail_free = 'collectCard' in [card['action'] for card in next_player.cards]
+            get_out_of_jail_free = 'collectCard' in [self.state.cards[card]['action'] for card in next_player.cards]
             return [
                 actions.use_card() if get_out_of_jail_free else actions.leave_jail(amount=50),
                 actions.roll()
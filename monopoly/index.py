@@ -0,0 +1,127 @@
+from bisect import insort
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+
+def move(counter: Counter, key, before, after):
+    counter[key, before] -= 1
+    counter[key, after] += 1
+
+
+@lru_cache(maxsize=32)
+def next_of_type(types: tuple[int, ...]) -> dict[int, list[int]]:
+    size = len(types)
+    table = {}
+    for type in set(types):
+        next, following = [0] * size, None
+        for i in range(2 * size - 1, -1, -1):
+            if i < size:
+                next[i] = following % size
+            if types[i % size] == type:
+                following = i
+        table[type] = next
+
+    return table
+
+
+class BoardIndex:
+    def __init__(self, board: list[dict], sets: list[dict]):
+        self.sets = [property.get('set', 0) for property in board]
+        self.members = defaultdict(list)
+        self.owners = Counter()
+        self.mortgaged = Counter()
+        self.houses = Counter()
+        self.holders = [None] * len(board)
+        self.levels = [(False, 0)] * len(board)
+        self.holdings = defaultdict(list)
+        self.portfolio = Counter()
+        self.views = [None] * len(board)
+        self.shared = False
+        self.next = next_of_type(tuple(sets[set]['type'] for set in self.sets))
+
+        for position, property in enumerate(board):
+            set = self.sets[position]
+            self.members[set].append(position)
+            self.owners[set, property.get('owner')] += 1
+            self.mortgaged[set, property.get('mortgaged', False)] += 1
+            self.houses[set, property.get('houses', 0)] += 1
+            self.levels[position] = property.get('mortgaged', False), property.get('houses', 0)
+            self.hold(position, property.get('owner'), 1)
+
+    def fork(self) -> 'BoardIndex':
+        ''' Copy that shares counters and views with this index until either side changes '''
+        self.shared = True
+        index = object.__new__(BoardIndex)
+        vars(index).update(vars(self))
+        return index
+
+    def detach(self):
+        if self.shared:
+            self.owners, self.mortgaged, self.houses = self.owners.copy(), self.mortgaged.copy(), self.houses.copy()
+            self.holders, self.levels, self.views = list(self.holders), list(self.levels), list(self.views)
+            self.holdings = defaultdict(list, {owner: list(positions) for owner, positions in self.holdings.items()})
+            self.portfolio = self.portfolio.copy()
+            self.shared = False
+
+    def hold(self, position: int, owner: int | None, sign: int):
+        ''' Add a position to, or with a negative sign remove it from, its owner's holdings '''
+        if owner is None:
+            return
+        if sign > 0:
+            insort(self.holdings[owner], position)
+        else:
+            self.holdings[owner].remove(position)
+        self.holders[position] = owner if sign > 0 else None
+
+        mortgaged, houses = self.levels[position]
+        self.portfolio[owner, 'properties'] += sign
+        self.portfolio[owner, 'mortgaged'] += sign * mortgaged
+        self.portfolio[owner, 'houses'] += sign * houses
+
+    def owned_by(self, owner: int) -> list[int]:
+        return self.holdings.get(owner, [])
+
+    def totals(self, owner: int) -> dict[str, int]:
+        return {kind: self.portfolio[owner, kind] for kind in ('properties', 'mortgaged', 'houses')}
+
+    def count_owned(self, set: int, owner: int) -> int:
+        return self.owners[set, owner]
+
+    def is_full_set_owned(self, set: int, owner: int) -> bool:
+        return self.owners[set, owner] == len(self.members[set])
+    
+    def is_mortgage_free(self, set: int) -> bool:
+        return self.mortgaged[set, True] == 0
+    
+    def min_houses(self, set: int) -> int:
+        return next(houses for houses in range(6) if self.houses[set, houses] > 0)
+    
+    def max_houses(self, set: int) -> int:
+        return next(houses for houses in range(5, -1, -1) if self.houses[set, houses] > 0)
+    
+    def invalidate(self, position: int):
+        self.detach()
+        self.views[position] = None
+    
+    def acquire(self, position: int, before: int | None, after: int):
+        self.invalidate(position)
+        move(self.owners, self.sets[position], before, after)
+        self.hold(position, before, -1)
+        self.hold(position, after, 1)
+
+    def mortgage(self, position: int, before: bool, after: bool):
+        self.invalidate(position)
+        move(self.mortgaged, self.sets[position], before, after)
+        self.level(position, after, self.levels[position][1])
+
+    def build(self, position: int, before: int, after: int):
+        self.invalidate(position)
+        move(self.houses, self.sets[position], before, after)
+        self.level(position, self.levels[position][0], after)
+
+    def level(self, position: int, mortgaged: bool, houses: int):
+        owner = self.holders[position]
+        if owner is not None:
+            self.portfolio[owner, 'mortgaged'] += mortgaged - self.levels[position][0]
+            self.portfolio[owner, 'houses'] += houses - self.levels[position][1]
+        self.levels[position] = mortgaged, houses
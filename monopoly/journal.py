@@ -0,0 +1,76 @@
+import pickle
+from typing import NamedTuple
+from monopoly.state import GameState, StateUpdater
+
+
+OPERATIONS = [
+    'set_roll', 'set_player', 'swap_card', 'go_to', 'go_to_jail', 'collect_card', 'use_card',
+    'leave_jail', 'serve_time', 'mortgage_property', 'encumber', 'unmortgage_property', 'develop',
+    'demolish', 'pay_bank', 'pay_player', 'pay_each_player', 'acquire_property', 'save', 'auction',
+    'set_order', 'bid', 'set_action', 'clear_auction', 'resume', 'start', 'set_auto'
+]
+
+OPCODES = {name: i for i, name in enumerate(OPERATIONS)}
+
+
+class Event(NamedTuple):
+    op: int
+    args: tuple
+
+
+def encode_snapshot(state: GameState) -> bytes:
+    return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_snapshot(snapshot: bytes) -> GameState:
+    return pickle.loads(snapshot)
+
+
+def encode_events(events: list[Event]) -> bytes:
+    return pickle.dumps([tuple(event) for event in events], protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_events(data: bytes) -> list[Event]:
+    return [Event(*event) for event in pickle.loads(data)]
+
+
+def replay(snapshot: bytes, events: list[Event]) -> GameState:
+    state = decode_snapshot(snapshot)
+    updater = StateUpdater(state)
+    for op, args in events:
+        getattr(updater, OPERATIONS[op])(*args)
+    return state
+
+
+class Journal:
+    def __init__(self, state: GameState, every: int=200, snapshot: bytes | None=None, events: list[Event] | None=None):
+        self.every = every
+        self.snapshot = snapshot if snapshot is not None else encode_snapshot(state)
+        self.events = events or []
+        self.pending = []
+        self.compacted = False
+        self.depth = 0
+        state.journal = self
+
+    def record(self, name: str, args: tuple, state: GameState):
+        event = Event(OPCODES[name], args)
+        self.events.append(event)
+        self.pending.append(event)
+        if len(self.events) >= self.every:
+            self.compact(state)
+
+    def compact(self, state: GameState):
+        self.snapshot = encode_snapshot(state)
+        self.events = []
+        self.pending = []
+        self.compacted = True
+
+    def drain(self) -> tuple[bytes | None, list[Event]]:
+        ''' Changes since the last drain: a new snapshot if one was taken, and the events recorded after it '''
+        snapshot = self.snapshot if self.compacted else None
+        pending = self.pending
+        self.pending, self.compacted = [], False
+        return snapshot, pending
+
+    def rebuild(self) -> GameState:
+        return replay(self.snapshot, self.events)
@@ -11,7 +11,7 @@ class Player:
     cards: list[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class Property:
     name: str
     type: int
@@ -1,62 +1,190 @@
+import json
+import logging
+import os
 import random
+import threading
+import time
+import weakref
 import requests
+from collections import deque
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from monopoly.deck import CardTable
 from monopoly.game import Game
 from monopoly.model import Player
 from monopoly.state import GameState, StateUpdater
+from monopoly.store import MemoryStore, SpillStore, SqliteStore
 
 
-class Board:
-    def __init__(self, port: int):
-        self.address = f'http://localhost:{port}'
+logger = logging.getLogger(__name__)
+
+RESOURCES = ['sets', 'properties', 'chance', 'communityChest']
+
+
+class Catalog:
+    def get(self) -> dict:
+        raise NotImplementedError
 
     def get_sets(self):
-        response = requests.get(f'{self.address}/sets')
-        return response.json()
+        return self.get()['sets']
     
     def get_properties(self):
-        response = requests.get(f'{self.address}/properties')
-        return response.json()
+        return self.get()['properties']
     
     def get_chance(self):
-        response = requests.get(f'{self.address}/chance')
-        return response.json()
+        return self.get()['chance']
     
     def get_community_chest(self):
-        response = requests.get(f'{self.address}/communityChest')
-        return response.json()
+        return self.get()['communityChest']
+
+    def get_cards(self, batch: int=0) -> CardTable:
+        return CardTable({'Chance': self.get_chance(), 'Community Chest': self.get_community_chest()}, batch)
+
+
+class Board(Catalog):
+    def __init__(self, port: int, timeout: float=5, retries: int=3, backoff: float=0.1, pool_size: int=10):
+        self.address = f'http://localhost:{port}'
+        self.timeout = timeout
+        self.timings = deque(maxlen=1000)
+
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=[502, 503, 504], allowed_methods=['GET'])
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_maxsize=pool_size, max_retries=retry))
+
+    def fetch(self, resource: str, etag: str | None=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        start = time.perf_counter()
+        response = self.session.get(f'{self.address}/{resource}', headers=headers, timeout=self.timeout)
+        elapsed = time.perf_counter() - start
+
+        self.timings.append((resource, response.status_code, elapsed))
+        logger.debug('GET /%s %d in %.1f ms', resource, response.status_code, 1000 * elapsed)
+        response.raise_for_status()
+        return response
+
+    def load(self, etag: str | None=None) -> tuple[dict | None, str | None]:
+        response = self.fetch('db', etag)
+        if response.status_code == 304:
+            return None, etag
+        
+        catalog = response.json()
+        return {resource: catalog[resource] for resource in RESOURCES}, response.headers.get('ETag')
+
+    def get(self) -> dict:
+        catalog, _ = self.load()
+        return catalog
+
+
+class LocalBoard(Catalog):
+    def __init__(self, path: str='json/board.json'):
+        self.path = path
+
+    def load(self, etag: tuple | None=None) -> tuple[dict | None, tuple]:
+        stat = os.stat(self.path)
+        tag = (stat.st_mtime_ns, stat.st_size)
+        if tag == etag:
+            return None, etag
+        
+        with open(self.path) as file:
+            return json.load(file), tag
+        
+    def get(self) -> dict:
+        catalog, _ = self.load()
+        return catalog
+
+
+class BoardCatalog(Catalog):
+    def __init__(self, source: Board | LocalBoard, ttl: float=60, clock=time.monotonic, batch: int=256):
+        self.source = source
+        self.batch = batch
+        self.ttl = ttl
+        self.clock = clock
+        self.catalog = None
+        self.etag = None
+        self.expires = 0
+        self.cards = None, None
+
+    def get(self) -> dict:
+        now = self.clock()
+        if self.catalog is None or now >= self.expires:
+            catalog, self.etag = self.source.load(self.etag)
+            if catalog is not None:
+                self.catalog = catalog
+            self.expires = now + self.ttl
+        
+        return self.catalog
+
+    def get_cards(self) -> CardTable:
+        catalog, cards = self.cards
+        if catalog is not self.get():
+            self.cards = catalog, cards = self.catalog, super().get_cards(self.batch)
+        return cards
+
+
+def new_game(board: Board | Catalog, rng=random, players: int=3) -> tuple[Game, GameState]:
+    cards = board.get_cards()
+    state = GameState(
+        board=[dict(property) for property in board.get_properties()],
+        sets=board.get_sets(),
+        decks=cards.deal(rng),
+        players=[Player(1200, 0, 0, 0, []) for i in range(players)],
+        player=0,
+        started=False,
+        roll=0,
+        cards=cards.cards
+    )
+    game = Game(
+        state,
+        StateUpdater(state),
+        rng
+    )
+
+    return game, state
 
 
 class GameServer:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board | Catalog, store: MemoryStore | SpillStore | SqliteStore | None=None):
         self.board = board
-        self.games = []
+        self.store = store if store is not None else MemoryStore()
+        self.locks = weakref.WeakValueDictionary()
+        self.guard = threading.Lock()
+
+    def lock(self, id: int) -> threading.Lock:
+        ''' The game's lock, kept only while some request holds or waits on it '''
+        with self.guard:
+            lock = self.locks.get(id)
+            if lock is None:
+                lock = self.locks[id] = threading.Lock()
+            return lock
 
     def exists(self, id: int) -> bool:
-        return id < len(self.games)
+        return id in self.store
+
+    @property
+    def epoch(self) -> str:
+        return self.store.epoch
+
+    def version(self, id: int) -> int | None:
+        try:
+            return self.store.version(id)
+        except KeyError:
+            return None
 
     def get(self, id: int) -> tuple[Game, GameState]:
-        return self.games[id]
+        state = self.store.get(id)
+        return Game(state, StateUpdater(state)), state
+
+    @contextmanager
+    def read(self, id: int):
+        with self.lock(id):
+            yield self.get(id)
+
+    @contextmanager
+    def checkout(self, id: int):
+        with self.lock(id), self.store.checkout(id) as state:
+            yield Game(state, StateUpdater(state)), state
 
     def create(self) -> int:
-        next_id = len(self.games)
-        chance = self.board.get_chance()
-        community_chest = self.board.get_community_chest()
-        state = GameState(
-            board=self.board.get_properties(),
-            sets=self.board.get_sets(),
-            decks={
-                'Chance': random.sample(chance, len(chance)),
-                'Community Chest': random.sample(community_chest, len(community_chest))
-            },
-            players=[Player(1200, 0, 0, 0, []) for i in range(3)],
-            player=0,
-            started=False,
-            roll=0
-        )
-        game = Game(
-            state,
-            StateUpdater(state)
-        )
-
-        self.games.append((game, state))
-        return next_id
+        _, state = new_game(self.board)
+        return self.store.add(state)
@@ -0,0 +1,208 @@
+import argparse
+import csv
+import json
+import sys
+from dataclasses import asdict, dataclass
+import numpy as np
+from monopoly.index import next_of_type
+from monopoly.model import PropertyType
+from monopoly.server import LocalBoard
+
+
+STAY, POSITION, NEAREST, OFFSET, JAIL = range(5)
+
+DECKS = {'Chance': 'chance', 'Community Chest': 'communityChest'}
+
+
+@dataclass
+class Deck:
+    squares: np.ndarray
+    kinds: np.ndarray
+    values: np.ndarray
+
+
+@dataclass
+class Landing:
+    position: int
+    name: str
+    probability: float
+    low: float
+    high: float
+    rent: list[float]
+
+
+def encode_card(card: dict) -> tuple[int, int]:
+    if card['action'] == 'goToJail':
+        return JAIL, 0
+    if card['action'] not in ['jump', 'passGo']:
+        return STAY, 0
+    if 'type' in card:
+        return NEAREST, card['type']
+    if 'offset' in card:
+        return OFFSET, card['offset']
+    return POSITION, card['position']
+
+
+def load_decks(catalog: dict, rng: np.random.Generator) -> list[Deck]:
+    names = [property['name'] for property in catalog['properties']]
+    decks = []
+    for name, resource in DECKS.items():
+        cards = [encode_card(card) for card in catalog[resource]]
+        order = rng.permutation(len(cards))
+        decks.append(Deck(
+            squares=np.array([i for i, square in enumerate(names) if square == name]),
+            kinds=np.array([cards[i][0] for i in order]),
+            values=np.array([cards[i][1] for i in order])
+        ))
+    return decks
+
+
+def nearest_table(catalog: dict) -> np.ndarray:
+    types = tuple(catalog['sets'][property.get('set', 0)]['type'] for property in catalog['properties'])
+    size = len(types)
+    table = np.tile(np.arange(size), (max(types) + 1, 1))
+    for type, next in next_of_type(types).items():
+        table[type] = next
+    return table
+
+
+class Simulation:
+    def __init__(self, catalog: dict, tokens: int, batches: int=20, seed: int | None=None):
+        names = [property['name'] for property in catalog['properties']]
+        self.size = len(names)
+        self.jail = names.index('Jail') if 'Jail' in names else 10
+        self.go_to_jail = names.index('Go To Jail') if 'Go To Jail' in names else -1
+        self.rng = np.random.default_rng(seed)
+        self.decks = load_decks(catalog, self.rng)
+        self.nearest = nearest_table(catalog)
+
+        self.batches = batches
+        self.batch = np.arange(tokens) % batches
+        self.position = np.zeros(tokens, dtype=np.int64)
+        self.in_jail = np.zeros(tokens, dtype=np.int8)
+        self.doubles = np.zeros(tokens, dtype=np.int8)
+        self.cursors = self.rng.integers(0, 1 << 16, size=(len(self.decks), tokens))
+        self.counts = np.zeros((batches, self.size), dtype=np.int64)
+
+    def send_to_jail(self, mask: np.ndarray):
+        self.position[mask] = self.jail
+        self.in_jail[mask] = 3
+        self.doubles[mask] = 0
+
+    def roll(self):
+        a, b = self.rng.integers(1, 7, size=(2, len(self.position)))
+        doubles = a == b
+        self.doubles = np.where(doubles, self.doubles + 1, 0).astype(np.int8)
+
+        speeding = doubles & (self.doubles == 3)
+        jailed = (self.in_jail > 0) & ~speeding
+        leaving = jailed & (doubles | (self.in_jail == 1))
+        serving = jailed & ~leaving
+        moving = ((self.in_jail == 0) & ~speeding) | leaving
+
+        self.in_jail[serving] -= 1
+        self.in_jail[leaving] = 0
+        self.position[moving] = (self.position[moving] + a[moving] + b[moving]) % self.size
+        self.send_to_jail(speeding)
+        self.resolve(moving)
+
+    def resolve(self, active: np.ndarray):
+        for _ in range(3):
+            if not active.any():
+                break
+            self.send_to_jail(active & (self.position == self.go_to_jail))
+
+            moved = np.zeros_like(active)
+            for d, deck in enumerate(self.decks):
+                drawing = np.flatnonzero(active & np.isin(self.position, deck.squares))
+                card = self.cursors[d, drawing] % len(deck.kinds)
+                self.cursors[d, drawing] += 1
+                kinds, values, position = deck.kinds[card], deck.values[card], self.position[drawing]
+
+                nearest = self.nearest[np.where(kinds == NEAREST, values, 0), position]
+                self.position[drawing] = np.select(
+                    [kinds == POSITION, kinds == NEAREST, kinds == OFFSET],
+                    [values, nearest, (position + values) % self.size],
+                    position
+                )
+
+                jailing = np.zeros_like(active)
+                jailing[drawing[kinds == JAIL]] = True
+                self.send_to_jail(jailing)
+                moved[drawing[(kinds != STAY) & (kinds != JAIL)]] = True
+
+            active = moved
+
+    def record(self):
+        flat = self.batch * self.size + self.position
+        self.counts += np.bincount(flat, minlength=self.batches * self.size).reshape(self.batches, self.size)
+
+    def run(self, rolls: int, burn_in: int=0) -> np.ndarray:
+        for i in range(burn_in + rolls):
+            self.roll()
+            if i >= burn_in:
+                self.record()
+        return self.counts
+
+
+def expected_rent(catalog: dict, position: int, probability: float) -> list[float]:
+    property = catalog['properties'][position]
+    type = PropertyType(catalog['sets'][property.get('set', 0)]['type'])
+    if type == PropertyType.UTILITY:
+        return [probability * 4 * 7, probability * 10 * 7]
+    return [probability * rent for rent in property.get('rent', [])]
+
+
+def summarise(catalog: dict, counts: np.ndarray, z: float=1.96) -> list[Landing]:
+    frequencies = counts / counts.sum(axis=1, keepdims=True)
+    mean = frequencies.mean(axis=0)
+    error = z * frequencies.std(axis=0, ddof=1) / np.sqrt(len(counts))
+
+    return [
+        Landing(
+            position=i,
+            name=property['name'],
+            probability=float(mean[i]),
+            low=float(mean[i] - error[i]),
+            high=float(mean[i] + error[i]),
+            rent=expected_rent(catalog, i, float(mean[i]))
+        )
+        for i, property in enumerate(catalog['properties'])
+    ]
+
+
+def simulate(catalog: dict, tokens: int=100_000, rolls: int=100, burn_in: int=20, batches: int=20, seed: int | None=None) -> list[Landing]:
+    simulation = Simulation(catalog, tokens, batches, seed)
+    return summarise(catalog, simulation.run(rolls, burn_in))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Estimate landing frequency and expected rent for each square')
+    parser.add_argument('--board', default='json/board.json')
+    parser.add_argument('--tokens', type=int, default=100_000)
+    parser.add_argument('--rolls', type=int, default=100)
+    parser.add_argument('--burn-in', type=int, default=20)
+    parser.add_argument('--batches', type=int, default=20)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+    args = parser.parse_args(argv)
+
+    catalog = LocalBoard(args.board).get()
+    landings = simulate(catalog, args.tokens, args.rolls, args.burn_in, args.batches, args.seed)
+
+    if args.format == 'json':
+        json.dump([asdict(landing) for landing in landings], sys.stdout, indent=2)
+        return
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['position', 'name', 'probability', 'low', 'high', 'rent'])
+    for landing in landings:
+        writer.writerow([
+            landing.position, landing.name,
+            f'{landing.probability:.5f}', f'{landing.low:.5f}', f'{landing.high:.5f}',
+            ' '.join(f'{rent:.2f}' for rent in landing.rent)
+        ])
+
+
+if __name__ == '__main__':
+    main()
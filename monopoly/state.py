@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from monopoly.index import BoardIndex
 from monopoly.model import Player, Property
 
 
@@ -13,14 +16,108 @@ class GameState:
     roll: tuple[int, int]
     restore: dict | None = None
     auction: dict | None = None
+    action: dict | list | None = None
+    cards: list[dict] = field(default_factory=list, repr=False)
+    auto: bool = False
+    version: int = field(default=0, compare=False)
+    index: BoardIndex | None = field(default=None, repr=False, compare=False)
+    journal: object | None = field(default=None, repr=False, compare=False)
+    private: set | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.index is None:
+            self.index = BoardIndex(self.board, self.sets)
+
+    def __getstate__(self):
+        return {k: v for k, v in vars(self).items() if k not in ['index', 'journal', 'private']}
+    
+    def __setstate__(self, state):
+        vars(self).update(state, index=None, journal=None, private=None)
+        self.__post_init__()
+
+    def fork(self) -> 'GameState':
+        ''' Copy that shares properties, players and decks with this state until either side changes them '''
+        self.private = set()
+        forked = object.__new__(GameState)
+        vars(forked).update(
+            vars(self),
+            board=list(self.board),
+            decks=dict(self.decks),
+            players=list(self.players),
+            index=self.index.fork(),
+            journal=None,
+            private=set()
+        )
+        return forked
+
+    def rollback(self, backup: 'GameState'):
+        ''' Return to a fork taken earlier, keeping the version moving forward and snapshotting the journal '''
+        version, journal = self.version, self.journal
+        vars(self).update(vars(backup), journal=journal, private=set(), version=version + 1)
+        if journal is not None:
+            journal.compact(self)
+
+    def owns(self, key) -> bool:
+        if self.private is None or key in self.private:
+            return True
+        self.private.add(key)
+        return False
+
+    def own_property(self, position: int) -> dict:
+        if not self.owns(('board', position)):
+            self.board[position] = dict(self.board[position])
+        return self.board[position]
+
+    def own_player(self, player: int) -> Player:
+        if not self.owns(('players', player)):
+            self.players[player] = replace(self.players[player], cards=list(self.players[player].cards))
+        return self.players[player]
+
+    def own_deck(self, name: str) -> deque[int]:
+        if not self.owns(('decks', name)):
+            self.decks[name] = deque(self.decks[name])
+        return self.decks[name]
+
+    def own_auction(self) -> dict:
+        if not self.owns('auction'):
+            self.auction = dict(self.auction)
+        return self.auction
+
+
+def event(func):
+    @wraps(func)
+    def inner(self, *args):
+        self.state.version += 1
+        journal = self.state.journal
+        if journal is None or journal.depth > 0:
+            return func(self, *args)
+        
+        journal.depth += 1
+        try:
+            result = func(self, *args)
+        finally:
+            journal.depth -= 1
+        journal.record(func.__name__, args, self.state)
+        return result
+    
+    return inner
         
 
 @dataclass
 class StateUpdater:
     state: GameState
 
+    @event
+    def start(self):
+        self.state.started = True
+
+    @event
+    def set_auto(self, auto: bool):
+        self.state.auto = auto
+
+    @event
     def set_roll(self, roll: tuple[int, int]):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         self.state.roll = roll
 
         a, b = roll
@@ -29,103 +126,126 @@ class StateUpdater:
         else:
             player.doubles = 0
 
+    @event
     def set_player(self, player):
         self.state.player = player
 
+    @event
     def swap_card(self, deck: str):
-        card = self.state.decks[deck].pop(0)
-        self.state.decks[deck].append(card)
+        self.state.own_deck(deck).rotate(-1)
 
+    @event
     def go_to(self, destination: int):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         player.position = destination
 
+    @event
     def go_to_jail(self):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         player.position = 10
         player.in_jail = 3
         player.doubles = 0
 
+    @event
     def collect_card(self, name):
-        player = self.state.players[self.state.player]
-        deck = self.state.decks[name]
-        card, self.state.decks[name] = deck[0], deck[1:]
-        player.cards += [card]
+        player = self.state.own_player(self.state.player)
+        card = self.state.own_deck(name).popleft()
+        player.cards.append(card)
 
+    @event
     def use_card(self):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         card = player.cards.pop(0)
-        self.state.decks[card['deck']].append(card)
+        self.state.own_deck(self.state.cards[card]['deck']).append(card)
 
+    @event
     def leave_jail(self):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         player.in_jail = 0
 
+    @event
     def serve_time(self):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         if player.in_jail > 0:
             player.in_jail -= 1
 
+    @event
     def mortgage_property(self, position: int, amount: int):
-        property = self.state.board[position]
-        player = self.state.players[property['owner']]
+        property = self.state.own_property(position)
+        player = self.state.own_player(property['owner'])
         player.cash += amount
+        self.state.index.mortgage(position, property.get('mortgaged', False), True)
         property['mortgaged'] = True
     
+    @event
     def encumber(self, position: int):
-        property = self.state.board[position]
+        property = self.state.own_property(position)
         property['encumbered'] = True
+        self.state.index.invalidate(position)
 
+    @event
     def unmortgage_property(self, position: int, repayment: int):
-        property = self.state.board[position]
-        player = self.state.players[property['owner']]
+        property = self.state.own_property(position)
+        player = self.state.own_player(property['owner'])
         player.cash -= repayment
+        self.state.index.mortgage(position, property.get('mortgaged', False), False)
         property['mortgaged'] = False
 
+    @event
     def develop(self, position: int, cost: int):
-        property = self.state.board[position]
-        player = self.state.players[property['owner']]
+        property = self.state.own_property(position)
+        player = self.state.own_player(property['owner'])
         player.cash -= cost
         if 'houses' not in property:
             property['houses'] = 0
+        self.state.index.build(position, property['houses'], property['houses'] + 1)
         property['houses'] += 1
 
+    @event
     def demolish(self, position: int, proceeds: int):
-        property = self.state.board[position]
-        player = self.state.players[property['owner']]
+        property = self.state.own_property(position)
+        player = self.state.own_player(property['owner'])
         player.cash += proceeds
+        self.state.index.build(position, property['houses'], property['houses'] - 1)
         property['houses'] -= 1
 
+    @event
     def pay_bank(self, amount: int):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         player.cash -= amount
 
+    @event
     def pay_player(self, payee: int, amount: int):
-        player = self.state.players[self.state.player]
-        payee = self.state.players[payee]
+        player = self.state.own_player(self.state.player)
+        payee = self.state.own_player(payee)
         player.cash -= amount
         payee.cash += amount
     
+    @event
     def pay_each_player(self, amount: int):
-        player = self.state.players[self.state.player]
+        player = self.state.own_player(self.state.player)
         player.cash -= amount * (len(self.state.players) - 1)
 
         for i in range(len(self.state.players)):
             if i == self.state.player:
                 continue
-            payee = self.state.players[i]
+            payee = self.state.own_player(i)
             payee.cash += amount
 
+    @event
     def acquire_property(self, position: int):
-        property = self.state.board[position]
+        property = self.state.own_property(position)
+        self.state.index.acquire(position, property.get('owner'), self.state.player)
         property['owner'] = self.state.player
 
+    @event
     def save(self, interrupt):
         self.state.restore = {
             'nextPlayer': self.state.player,
             'nextAction': self.state.action if interrupt else None
         }
 
+    @event
     def auction(self, orders, order):
         self.state.auction = {
             'orders': orders,
@@ -134,12 +254,14 @@ class StateUpdater:
             'amount': 0
         }
 
+    @event
     def set_order(self, next):
-        auction = self.state.auction
+        auction = self.state.own_auction()
         auction['order'] = next
         order = auction['orders'][next]
         self.set_player(order['attendee'])
 
+    @event
     def bid(self, amount):
         player = self.state.player
         self.state.auction = {
@@ -148,6 +270,15 @@ class StateUpdater:
             'amount': amount
         }
 
+    @event
+    def set_action(self, action):
+        self.state.action = action
+
+    @event
+    def clear_auction(self):
+        self.state.auction = None
+
+    @event
     def resume(self, action=None):
         if not self.state.restore:
             return action
@@ -0,0 +1,310 @@
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from itertools import count
+from monopoly.journal import Journal, decode_events, encode_events, encode_snapshot, replay
+from monopoly.state import GameState
+
+
+class LeaseExpired(Exception):
+    pass
+
+
+def new_epoch() -> str:
+    ''' Tells apart stores that number games and versions from the same start, such as after a restart '''
+    return secrets.token_hex(4)
+
+
+class MemoryStore:
+    def __init__(self):
+        self.games = {}
+        self.ids = count()
+        self.epoch = new_epoch()
+        self.stats = Counter()
+
+    def __contains__(self, id: int) -> bool:
+        return id in self.games
+
+    def add(self, state: GameState) -> int:
+        id = next(self.ids)
+        self.games[id] = state
+        return id
+
+    def get(self, id: int) -> GameState:
+        self.stats['hits'] += 1
+        return self.games[id]
+
+    def version(self, id: int) -> int:
+        return self.games[id].version
+
+    @contextmanager
+    def checkout(self, id: int):
+        yield self.get(id)
+
+
+class SpillStore:
+    def __init__(self, directory: str, capacity: int=1000, idle: float | None=None, clock=time.monotonic):
+        self.directory = directory
+        self.capacity = capacity
+        self.idle = idle
+        self.clock = clock
+        self.games = OrderedDict()
+        self.pinned = Counter()
+        self.guard = threading.RLock()
+        self.stats = Counter()
+
+        os.makedirs(directory, exist_ok=True)
+        spilled = [int(name.split('.')[0]) for name in os.listdir(directory) if name.endswith('.pickle')]
+        self.ids = count(max(spilled, default=-1) + 1)
+        self.epoch = self.load_epoch()
+
+    def load_epoch(self) -> str:
+        path = os.path.join(self.directory, 'epoch')
+        if not os.path.exists(path):
+            with open(path, 'w') as file:
+                file.write(new_epoch())
+        with open(path) as file:
+            return file.read().strip()
+
+    def path(self, id: int) -> str:
+        return os.path.join(self.directory, f'{id}.pickle')
+
+    def __contains__(self, id: int) -> bool:
+        with self.guard:
+            return id in self.games or os.path.exists(self.path(id))
+
+    def add(self, state: GameState) -> int:
+        id = next(self.ids)
+        self.keep(id, state)
+        return id
+
+    def get(self, id: int) -> GameState:
+        with self.guard:
+            if id in self.games:
+                self.stats['hits'] += 1
+                state, _ = self.games.pop(id)
+            else:
+                self.stats['misses'] += 1
+                state = self.load(id)
+
+            self.keep(id, state)
+            return state
+
+    def version(self, id: int) -> int:
+        with self.guard:
+            if id in self.games:
+                return self.games[id][0].version
+            try:
+                with open(f'{self.path(id)}.version') as file:
+                    return int(file.read())
+            except FileNotFoundError:
+                raise KeyError(id) from None
+
+    @contextmanager
+    def checkout(self, id: int):
+        ''' Pins the game while it is checked out, so eviction never pickles it mid-change '''
+        with self.guard:
+            self.pinned[id] += 1
+        try:
+            state = self.get(id)
+            try:
+                yield state
+            finally:
+                self.keep(id, state)
+        finally:
+            with self.guard:
+                self.pinned[id] -= 1
+                if not self.pinned[id]:
+                    del self.pinned[id]
+                    self.evict(self.clock())
+
+    def keep(self, id: int, state: GameState):
+        with self.guard:
+            now = self.clock()
+            self.games[id] = (state, now)
+            self.games.move_to_end(id)
+            self.evict(now)
+
+    def evict(self, now: float):
+        victims, excess = [], len(self.games) - self.capacity
+        for id, (state, accessed) in self.games.items():
+            expired = self.idle is not None and now - accessed > self.idle
+            if excess <= 0 and not expired:
+                break
+            if id not in self.pinned:
+                victims.append((id, state))
+                excess -= 1
+
+        for id, state in victims:
+            self.spill(id, state)
+            del self.games[id]
+            self.stats['evictions'] += 1
+
+    def flush(self):
+        with self.guard:
+            for id, (state, _) in self.games.items():
+                self.spill(id, state)
+
+    def spill(self, id: int, state: GameState):
+        ''' Writes the game, then its version beside it so polls can revalidate without loading it '''
+        path = self.path(id)
+        with open(f'{path}.tmp', 'wb') as file:
+            pickle.dump(state, file)
+        os.replace(f'{path}.tmp', path)
+        with open(f'{path}.version.tmp', 'w') as file:
+            file.write(str(state.version))
+        os.replace(f'{path}.version.tmp', f'{path}.version')
+
+    def load(self, id: int) -> GameState:
+        with open(self.path(id), 'rb') as file:
+            return pickle.load(file)
+
+
+class SqliteStore:
+    def __init__(self, path: str, cache_size: int=100, lease: float=10, wait: float=0.001, snapshot_every: int=200):
+        self.path = path
+        self.cache_size = cache_size
+        self.snapshot_every = snapshot_every
+        self.lease = lease
+        self.wait = wait
+        self.cache = OrderedDict()
+        self.guard = threading.Lock()
+        self.local = threading.local()
+        self.holder = f'{os.getpid()}-{id(self)}'
+        self.stats = Counter()
+
+        self.connection().executescript('''
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                version INTEGER NOT NULL DEFAULT 0,
+                state BLOB NOT NULL,
+                holder TEXT,
+                lease REAL
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                game INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (game, version)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        ''')
+        connection = self.connection()
+        connection.execute("INSERT OR IGNORE INTO meta VALUES ('epoch', ?)", (new_epoch(),))
+        self.epoch, = connection.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()
+
+    def connection(self) -> sqlite3.Connection:
+        if not hasattr(self.local, 'connection'):
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.local.connection = connection
+        return self.local.connection
+
+    def __contains__(self, id: int) -> bool:
+        return self.connection().execute('SELECT 1 FROM games WHERE id = ?', (id,)).fetchone() is not None
+
+    def add(self, state: GameState) -> int:
+        snapshot = encode_snapshot(state)
+        cursor = self.connection().execute('INSERT INTO games (state) VALUES (?)', (snapshot,))
+        Journal(state, self.snapshot_every, snapshot)
+        self.remember(cursor.lastrowid, 0, state)
+        return cursor.lastrowid
+
+    def get(self, id: int) -> GameState:
+        return self.fetch(id, self.version(id))
+
+    def version(self, id: int) -> int:
+        row = self.connection().execute('SELECT version FROM games WHERE id = ?', (id,)).fetchone()
+        if row is None:
+            raise KeyError(id)
+        return row[0]
+
+    def fetch(self, id: int, version: int) -> GameState:
+        with self.guard:
+            cached = self.cache.get(id)
+            if cached is not None and cached[0] == version:
+                self.stats['hits'] += 1
+                self.cache.move_to_end(id)
+                return cached[1]
+
+        self.stats['misses'] += 1
+        connection = self.connection()
+        snapshot, = connection.execute('SELECT state FROM games WHERE id = ?', (id,)).fetchone()
+        rows = connection.execute('SELECT data FROM events WHERE game = ? ORDER BY version', (id,))
+        events = [event for data, in rows for event in decode_events(data)]
+
+        state = replay(snapshot, events)
+        Journal(state, self.snapshot_every, snapshot, events)
+        self.remember(id, version, state)
+        return state
+
+    def remember(self, id: int, version: int, state: GameState):
+        with self.guard:
+            self.cache[id] = (version, state)
+            self.cache.move_to_end(id)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def forget(self, id: int):
+        with self.guard:
+            self.cache.pop(id, None)
+
+    def acquire(self, id: int, holder: str) -> int:
+        connection = self.connection()
+        while True:
+            now = time.time()
+            cursor = connection.execute(
+                'UPDATE games SET holder = ?, lease = ? WHERE id = ? AND (lease IS NULL OR lease < ?)',
+                (holder, now + self.lease, id, now)
+            )
+            if cursor.rowcount == 1:
+                return connection.execute('SELECT version FROM games WHERE id = ?', (id,)).fetchone()[0]
+            if id not in self:
+                raise KeyError(id)
+            time.sleep(self.wait)
+
+    @contextmanager
+    def checkout(self, id: int):
+        holder = f'{self.holder}-{threading.get_ident()}'
+        version = self.acquire(id, holder)
+        connection = self.connection()
+        try:
+            state = self.fetch(id, version)
+            yield state
+        except BaseException:
+            self.forget(id)
+            connection.execute('UPDATE games SET holder = NULL, lease = NULL WHERE id = ? AND holder = ?', (id, holder))
+            raise
+
+        snapshot, events = state.journal.drain()
+        if snapshot is None and not events:
+            connection.execute('UPDATE games SET holder = NULL, lease = NULL WHERE id = ? AND holder = ?', (id, holder))
+            return
+
+        connection.execute('BEGIN IMMEDIATE')
+        cursor = connection.execute(
+            'UPDATE games SET version = version + 1, holder = NULL, lease = NULL WHERE id = ? AND holder = ?',
+            (id, holder)
+        )
+        if cursor.rowcount != 1:
+            connection.execute('ROLLBACK')
+            self.forget(id)
+            raise LeaseExpired(id)
+
+        if snapshot is not None:
+            connection.execute('UPDATE games SET state = ? WHERE id = ?', (snapshot, id))
+            connection.execute('DELETE FROM events WHERE game = ?', (id,))
+        if events:
+            connection.execute('INSERT INTO events (game, version, data) VALUES (?, ?, ?)', (id, version + 1, encode_events(events)))
+        connection.execute('COMMIT')
+        self.remember(id, version + 1, state)
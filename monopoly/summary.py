@@ -0,0 +1,33 @@
+import json
+from monopoly.state import GameState
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def summarize(id: int, state: GameState) -> dict:
+    return {
+        'game': int(id),
+        'version': state.version,
+        'player': state.player,
+        'started': state.started,
+        'auto': state.auto,
+        'roll': state.roll,
+        'players': [
+            {'cash': player.cash, 'position': player.position, 'inJail': player.in_jail, 'doubles': player.doubles, 'cards': player.cards}
+            for player in state.players
+        ],
+        'properties': [
+            {'position': position, 'owner': property['owner'], 'houses': property.get('houses', 0), 'mortgaged': property.get('mortgaged', False)}
+            for position, property in enumerate(state.board) if property.get('owner') is not None
+        ],
+        'auction': state.auction
+    }
+
+
+def dumps(document) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(document)
+    return json.dumps(document, separators=(',', ':')).encode()
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from monopoly.engine import Engine, GreedyStrategy, RandomStrategy, Strategy
+from monopoly.server import BoardCatalog, LocalBoard
+
+
+STRATEGIES = {
+    'greedy': GreedyStrategy,
+    'random': RandomStrategy,
+    'default': Strategy
+}
+
+
+@dataclass
+class Standings:
+    games: int = 0
+    turns: int = 0
+    shortest: int | None = None
+    longest: int | None = None
+    wins: dict[str, int] = field(default_factory=dict)
+    bankruptcies: dict[str, int] = field(default_factory=dict)
+
+    def record(self, seats: list[str], winner: int, turns: int, bankrupt: int | None):
+        self.games += 1
+        self.turns += turns
+        self.shortest = turns if self.shortest is None else min(self.shortest, turns)
+        self.longest = turns if self.longest is None else max(self.longest, turns)
+        self.wins[seats[winner]] = self.wins.get(seats[winner], 0) + 1
+        if bankrupt is not None:
+            self.bankruptcies[seats[bankrupt]] = self.bankruptcies.get(seats[bankrupt], 0) + 1
+
+    def merge(self, other: 'Standings'):
+        self.games += other.games
+        self.turns += other.turns
+        for bound, pick in [('shortest', min), ('longest', max)]:
+            values = [value for value in [getattr(self, bound), getattr(other, bound)] if value is not None]
+            setattr(self, bound, pick(values) if values else None)
+        for name, count in other.wins.items():
+            self.wins[name] = self.wins.get(name, 0) + count
+        for name, count in other.bankruptcies.items():
+            self.bankruptcies[name] = self.bankruptcies.get(name, 0) + count
+
+    def summary(self) -> dict:
+        return {
+            **asdict(self),
+            'meanTurns': self.turns / self.games if self.games else 0,
+            'winRates': {name: wins / self.games for name, wins in self.wins.items()}
+        }
+
+
+@dataclass
+class Config:
+    strategies: list[str]
+    seed: int
+    chunk: int
+    max_turns: int
+    board: str
+
+
+engine = None
+
+
+def start_worker(config: Config):
+    global engine
+    engine = Engine(
+        BoardCatalog(LocalBoard(config.board), ttl=float('inf')),
+        max_turns=config.max_turns
+    )
+
+
+def play_chunk(config: Config, chunk: int, start: int, stop: int) -> tuple[int, int, int, Standings]:
+    standings = Standings()
+    for game in range(start, stop):
+        shift = game % len(config.strategies)
+        seats = config.strategies[shift:] + config.strategies[:shift]
+        engine.strategies = [STRATEGIES[name]() for name in seats]
+
+        result = engine.play(f'{config.seed}-{game}')
+        standings.record(seats, result.winner, result.turns, result.bankrupt)
+
+    return chunk, start, stop, standings
+
+
+def load_checkpoint(path: str | None, config: Config) -> tuple[dict[int, int], Standings]:
+    ''' Standings so far, and for each chunk the game its next run should start from '''
+    done, standings = {}, Standings()
+    if not path or not os.path.exists(path):
+        return done, standings
+
+    with open(path) as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines:
+        return done, standings
+
+    header, *lines = lines
+    if header != asdict(config):
+        raise ValueError(f'Checkpoint {path} was written for a different tournament')
+
+    for line in lines:
+        chunk = line['chunk']
+        done[chunk] = max(done.get(chunk, 0), line.get('stop', (chunk + 1) * config.chunk))
+        standings.merge(Standings(**line['standings']))
+    return done, standings
+
+
+def run(config: Config, games: int, workers: int | None=None, checkpoint: str | None=None):
+    ''' Play games across a process pool, yielding running standings as each chunk completes '''
+    done, standings = load_checkpoint(checkpoint, config)
+    ranges = [
+        (chunk, max(chunk * config.chunk, done.get(chunk, 0)), min((chunk + 1) * config.chunk, games))
+        for chunk in range(-(-games // config.chunk))
+    ]
+    chunks = [(chunk, start, stop) for chunk, start, stop in ranges if start < stop]
+    if not chunks:
+        yield standings
+        return
+
+    log = open(checkpoint, 'a') if checkpoint else None
+    try:
+        if log and log.tell() == 0:
+            log.write(json.dumps(asdict(config)) + '\n')
+
+        with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(config,)) as executor:
+            futures = [executor.submit(play_chunk, config, chunk, start, stop) for chunk, start, stop in chunks]
+            for future in as_completed(futures):
+                chunk, start, stop, result = future.result()
+                standings.merge(result)
+                if log:
+                    log.write(json.dumps({'chunk': chunk, 'start': start, 'stop': stop, 'standings': asdict(result)}) + '\n')
+                    log.flush()
+                yield standings
+    finally:
+        if log:
+            log.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play a tournament between automated strategies')
+    parser.add_argument('strategies', nargs='+', choices=sorted(STRATEGIES))
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--chunk', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=500)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--board', default='json/board.json')
+    parser.add_argument('--checkpoint')
+    args = parser.parse_args(argv)
+
+    config = Config(args.strategies, args.seed, args.chunk, args.max_turns, args.board)
+    standings = Standings()
+    for standings in run(config, args.games, args.workers, args.checkpoint):
+        print(f'{standings.games}/{args.games} games', file=sys.stderr)
+
+    json.dump(standings.summary(), sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,15 +14,23 @@ class View:
             **vars(player)
         }
     
+    def is_auto(self):
+        return self.state.auto
+
     def get_players(self):
         return self.state.players
+
+    def get_cards(self, player):
+        return [self.state.cards[card] for card in player.cards]
     
     def get_destination(self, destination):
         return get_property(self.state, destination)
     
     def owns_property(self, player):
-        properties = ((i, get_property(self.state, i)) for i in range(len(self.state.board)))
-        return [i for i, property in properties if property.owner == player]
+        return self.state.index.owned_by(player)
+
+    def get_holdings(self, player):
+        return self.state.index.totals(player)
     
     def last_bid(self):
         return self.state.auction
@@ -30,11 +38,12 @@ class View:
     def get_order(self, order):
         return self.state.auction['orders'][order]
 
-    def create(game: int, state: GameState, action: dict):
+    def create(game: int, state: GameState, action: dict, steps: list[dict] | None=None):
         view = {
             'game': game,
             'state': View(state),
-            'action': action
+            'action': action,
+            'steps': steps or []
         }
 
         if action is not None and 'message' in action:
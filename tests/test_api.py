@@ -0,0 +1,175 @@
+from monopoly import actions
+from monopoly.broadcast import Broadcaster
+from monopoly.engine import FORCED, options
+from monopoly.fragments import FragmentCache
+from monopoly.state import StateUpdater
+from monopoly.store import MemoryStore, SqliteStore
+from tests.utils.client import new_client
+
+
+def test_conditional_get(tmp_path):
+    for store in [MemoryStore(), SqliteStore(str(tmp_path / 'games.db'))]:
+        client, game = new_client(store=store)
+        with store.checkout(int(game.strip('/'))) as state:
+            StateUpdater(state).acquire_property(1)
+
+        first = client.get(game)
+        property = client.get(f'{game}/properties/1')
+
+        test_cases = [
+            (game, first.headers['ETag'], 304, "Unchanged game should not be sent again"),
+            (f'{game}/properties/1', property.headers['ETag'], 304, "Unchanged property should not be sent again"),
+            ('/1000', first.headers['ETag'], 302, "Missing game should still redirect")
+        ]
+
+        for path, etag, status, message in test_cases:
+            response = client.get(path, headers={'If-None-Match': etag})
+            assert response.status_code == status, message
+
+        client.post(f'{game}/roll')
+        changed = client.get(game, headers={'If-None-Match': first.headers['ETag']})
+
+        assert first.headers['Cache-Control'] == 'private, no-cache', "Polls should revalidate every time"
+        assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag'], "Changed game should be sent again"
+
+
+def test_etag_epoch(tmp_path):
+    path = str(tmp_path / 'games.db')
+    test_cases = [
+        (MemoryStore, MemoryStore, 200, "Restarted memory store should not confirm tags from before the restart"),
+        (lambda: SqliteStore(path), lambda: SqliteStore(path), 304, "Reopened database should keep confirming its tags")
+    ]
+
+    for before, after, status, message in test_cases:
+        client, game = new_client(store=before())
+        etag = client.get(game).headers['ETag']
+
+        restarted, _ = new_client(store=after())
+        assert restarted.get(game, headers={'If-None-Match': etag}).status_code == status, message
+
+
+def test_events():
+    broadcaster = Broadcaster(size=2)
+    client, game = new_client(broadcaster=broadcaster, keepalive=0.01)
+    streams = [iter(client.get(f'{game}/events').response) for _ in range(3)]
+    for stream in streams:
+        assert next(stream) == b': connected\n\n', "Subscriber should be told it is connected"
+
+    client.post(f'{game}/roll')
+    pushed = [next(stream) for stream in streams]
+
+    assert pushed[0].startswith(b'event: state\ndata: <div id="state">'), "Action should push the state fragment"
+    assert pushed.count(pushed[0]) == 3, "Every subscriber should get the same fragment"
+    assert broadcaster.stats['renders'] == 1, "Fragment should be rendered once for all subscribers"
+    assert next(streams[0]) == b': keepalive\n\n', "Idle stream should send keepalives"
+
+    client.head(f'{game}/events')
+    assert sum(map(len, broadcaster.subscribers.values())) == 3, "Stream that is never read should not subscribe"
+
+
+def test_slow_subscriber():
+    sut = Broadcaster(size=2)
+    subscription = sut.subscribe(0)
+    for i in range(5):
+        sut.publish(0, lambda: str(i))
+
+    assert [subscription.get(0), subscription.get(0), subscription.get(0)] == ['3', '4', None], "Slow subscriber should keep only the latest messages"
+    assert subscription.dropped == 3, "Dropped messages should be counted"
+
+
+def test_json_mode():
+    fragments = FragmentCache()
+    client, _ = new_client(fragments)
+    headers = {'Accept': 'application/json'}
+    created = client.get('/', headers=headers)
+    game = created.headers['Location']
+
+    joined = client.get(game, headers=headers)
+    rolled = client.post(f'{game}/roll', headers=headers)
+    html = client.get(game)
+
+    assert created.status_code == 201 and created.json['action'] == actions.roll(), "New game should start with a roll"
+    assert joined.json['state']['game'] == int(game.strip('/')) and len(joined.json['state']['players']) == 3, "Game should be summarised"
+    assert rolled.json['state']['version'] > joined.json['state']['version'], "Action should return the changed state"
+    assert 'action' in rolled.json['action'] or isinstance(rolled.json['action'], list), "Action should return the next action"
+    assert joined.headers['ETag'] != html.headers['ETag'] and 'Accept' in html.headers['Vary'], "Representations should be cached apart"
+    assert fragments.stats['misses'] == 7, "Only the HTML page should render fragments"
+
+
+def test_rejoin_mid_turn():
+    client, game = new_client(store=MemoryStore())
+    headers = {'Accept': 'application/json'}
+    rolled = client.post(f'{game}/roll', headers=headers)
+    rejoined = client.get(game, headers=headers)
+
+    assert rejoined.json['action'] == rolled.json['action'] != actions.roll(), "Rejoining should offer the pending action"
+
+
+def test_batch():
+    client, game = new_client(store=MemoryStore())
+    headers = {'Accept': 'application/json'}
+    turn = [actions.roll(), {'action': 'goTo'}, {'action': 'buy'}, actions.end_turn()]
+    test_cases = [
+        ([], 0, "Empty batch should apply nothing"),
+        (turn[:1], 1, "Roll should be applied"),
+        ([actions.end_turn()] * 3, 0, "Action that is not on offer should stop the batch")
+    ]
+
+    for batch, applied, message in test_cases:
+        response = client.post(f'{game}/batch', json=batch, headers=headers)
+        assert response.status_code == 200, message
+        assert len(response.json['applied']) == applied, message
+
+    before = client.get(game, headers=headers).json['state']
+    failed = client.post(f'{game}/batch', json=[{'action': 'goTo'}, {'action': 'mortgage', 'position': 0, 'amount': 1}], headers=headers)
+    after = client.get(game, headers=headers).json['state']
+
+    assert failed.status_code == 400, "Failing action should reject the batch"
+    assert {**after, 'version': 0} == {**before, 'version': 0}, "Failed batch should leave the game unchanged"
+    assert client.post(f'{game}/batch', json={'actions': 'roll'}).status_code == 400, "Malformed batch should be rejected"
+
+
+def test_batch_after_auction_route():
+    client, game = new_client(store=MemoryStore())
+    headers = {'Accept': 'application/json'}
+    client.post(f'{game}/auction/1', headers=headers)
+    response = client.post(f'{game}/batch', json=[{'action': 'bid', 'amount': 10}], headers=headers)
+
+    assert len(response.json['applied']) == 1, "Batch should pick up an auction opened by its own route"
+    assert options(response.json['action'])[0]['action'] == 'bid', "Auction should continue after the batch"
+
+
+def test_auto_resolve():
+    client, game = new_client(store=MemoryStore())
+    headers = {'Accept': 'application/json'}
+    test_cases = [
+        ('false', False, "Games should resolve forced actions only once they opt in"),
+        ('true', True, "Opted in games should chain forced actions up to a decision")
+    ]
+
+    for enabled, auto, message in test_cases:
+        response = client.post(f'{game}/auto?enabled={enabled}', headers=headers)
+        assert response.json['state']['auto'] is auto, message
+
+        resolved = 0
+        for _ in range(30):
+            choice, auction = options(response.json['action'])[0], response.json['state']['auction']
+            if choice['action'] == 'bid':
+                choice = {**choice, 'amount': 10} if auction['bidder'] is None else actions.stay()
+            response = client.post(f'{game}/batch', json=[choice], headers=headers)
+            pending, steps, state = response.json['action'], response.json['steps'], response.json['state']
+            resolved += len(steps)
+
+            assert all(step['action'] in FORCED for step in steps), message
+            if auto and isinstance(pending, dict) and state['players'][state['player']]['cash'] >= 0:
+                assert pending['action'] not in FORCED, message
+        assert (resolved > 0) is auto, message
+
+    store = MemoryStore()
+    client, game = new_client(store=store)
+    with store.checkout(int(game.strip('/'))) as state:
+        StateUpdater(state).go_to_jail()
+        StateUpdater(state).set_action(actions.leave_jail(15, 50))
+    response = client.post(f'{game}/auto', headers=headers)
+
+    assert [step['action'] for step in response.json['steps']] == ['leaveJail', 'goTo'], "Leaving jail as the only option should be resolved"
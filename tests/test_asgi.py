@@ -0,0 +1,91 @@
+import asyncio
+import re
+
+from quart import Quart, url_for
+
+from asgi import AsyncGameServer, configure_async_routing, parse
+from monopoly import actions
+from monopoly.broadcast import Broadcaster
+from monopoly.server import BoardCatalog, GameServer, LocalBoard
+
+
+def new_app(broadcaster=None, server=None):
+    server = AsyncGameServer(server or GameServer(BoardCatalog(LocalBoard())))
+    return configure_async_routing(Quart('asgi'), server, broadcaster=broadcaster, keepalive=0.01)
+
+
+def test_parse():
+    test_cases = [
+        (('goTo', 5, {}), {'action': 'goTo', 'position': 5}, "Path position should become the action position"),
+        (('rent', 5, {'amount': '12'}), {'action': 'rent', 'position': 5, 'amount': 12}, "Query amounts should be numbers"),
+        (('unmortgage', 3, {'amount': '33'}), {'action': 'liftMortgage', 'position': 3, 'amount': 33}, "Route names should map to engine actions"),
+        (('endAuction', 9, {}), {'action': 'endAuction', 'article': 9}, "Auction end should name its article"),
+        (('bid', None, {'price': '40'}), {'action': 'bid', 'amount': 40}, "Bid price should become the amount")
+    ]
+
+    for args, expected, message in test_cases:
+        assert parse(*args) == expected, message
+
+
+def test_async_routes():
+    async def run():
+        broadcaster = Broadcaster()
+        app = new_app(broadcaster)
+        client = app.test_client()
+        game = (await client.get('/')).location
+        joined = await client.get(game)
+
+        async with app.test_request_context('/'):
+            assert url_for('leave_jail', id=0, amount=50) == '/0/leaveJail?amount=50', "Templates should build leave jail links"
+
+        async with client.request(f'{game}/events') as events:
+            assert await events.receive() == b': connected\n\n', "Subscriber should be told it is connected"
+            rolled = await client.post(f'{game}/roll')
+            pushed = await events.receive()
+            await events.disconnect()
+
+        next_action = re.findall(r'hx-post="([^"]+)"', await rolled.get_data(as_text=True))[0]
+        followed = await client.post(next_action)
+        unchanged = await client.get(game, headers={'If-None-Match': (await client.get(game)).headers['ETag']})
+        return joined, rolled, pushed, followed, unchanged
+
+    joined, rolled, pushed, followed, unchanged = asyncio.run(run())
+
+    assert joined.status_code == 200 and joined.headers['ETag'], "Game page should carry an ETag"
+    assert rolled.status_code == 200, "Roll should render the next action"
+    assert pushed.startswith(b'event: state\ndata: <div id="state">'), "Action should push the state fragment"
+    assert followed.status_code == 200, "Returned action should be playable"
+    assert unchanged.status_code == 304, "Unchanged game should not be sent again"
+
+
+def test_auto_resolve_state_actions_only():
+    server = GameServer(BoardCatalog(LocalBoard()))
+    game = server.create()
+    with server.checkout(game) as (sut, _):
+        sut.updater.acquire_property(1)
+        sut.updater.set_auto(True)
+        sut.updater.pay_bank(1250)
+        sut.updater.set_action(actions.pay(10))
+
+    async def run():
+        client = new_app(server=server).test_client()
+        response = await client.post(f'/{game}/mortgage/1?amount=100', headers={'Accept': 'application/json'})
+        return await response.get_json()
+
+    mortgaged = asyncio.run(run())
+
+    assert mortgaged['steps'] == [] and mortgaged['action'] == actions.pay(10), "Property actions should not resolve forced actions"
+
+
+def test_rejoin_mid_turn():
+    async def run():
+        client = new_app().test_client()
+        headers = {'Accept': 'application/json'}
+        game = (await client.get('/')).location
+        rolled = await client.post(f'{game}/roll', headers=headers)
+        rejoined = await client.get(game, headers=headers)
+        return await rolled.get_json(), await rejoined.get_json()
+
+    rolled, rejoined = asyncio.run(run())
+
+    assert rejoined['action'] == rolled['action'] != actions.roll(), "Rejoining should offer the pending action"
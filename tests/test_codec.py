@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from monopoly import actions
+from monopoly.codec import Codec
+from monopoly.server import BoardCatalog, LocalBoard, new_game
+from tests.utils.play import play
+
+
+class OtherBoard(LocalBoard):
+    def get(self):
+        return {**super().get(), 'sets': []}
+
+
+def develop(game, state):
+    owned = [i for i, property in enumerate(state.board) if 'owner' in property]
+    game.updater.develop(owned[0], 50)
+    game.updater.mortgage_property(owned[-1], 100)
+    game.updater.unmortgage_property(owned[-1], 110)
+    game.updater.encumber(owned[-2])
+
+
+def test_codec():
+    board = BoardCatalog(LocalBoard())
+    sut = Codec(board)
+    test_cases = [
+        (0, None, "Fresh game should round trip"),
+        (40, None, "Game in progress should round trip"),
+        (400, develop, "Game with developed and mortgaged properties should round trip")
+    ]
+
+    for steps, prepare, message in test_cases:
+        game, state = new_game(board, random.Random(steps))
+        game.updater.set_action(play(game, actions.roll(), steps))
+        if prepare:
+            prepare(game, state)
+        data = sut.encode(state)
+
+        assert sut.decode(data) == state, message
+        assert sut.decode(data).version == state.version, "Version should round trip"
+        assert len(data) < 1024, "Encoded game should stay under 1 KB"
+
+    with pytest.raises(ValueError):
+        Codec(OtherBoard()).decode(data)
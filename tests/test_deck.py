@@ -0,0 +1,47 @@
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from monopoly.deck import CardTable
+from monopoly.server import BoardCatalog, LocalBoard
+
+
+def test_card_table():
+    sut = CardTable({'Chance': ['a', 'b', 'c'], 'Community Chest': ['d', 'e']}, batch=4)
+    test_cases = [
+        (sut.deal(random.Random(1)), "Seeded deal should shuffle each deck's ids"),
+        (sut.deal(), "Pooled deal should shuffle each deck's ids")
+    ]
+
+    for decks, message in test_cases:
+        assert sorted(decks['Chance']) == [0, 1, 2], message
+        assert sorted(decks['Community Chest']) == [3, 4], message
+
+    assert sut.deal(random.Random(1)) == sut.deal(random.Random(1)), "Seeded deals should repeat"
+    assert len(sut.pool) == 3, "Pooled deals should come from a pre-shuffled batch"
+    assert [sut.cards[id] for id in sut.ids['Community Chest']] == ['d', 'e'], "Ids should index the card table"
+
+
+def test_concurrent_deal():
+    sut = CardTable({'Chance': ['a', 'b', 'c'], 'Community Chest': ['d', 'e']}, batch=1)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            decks = list(executor.map(lambda _: sut.deal(), range(10000)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert all(sorted(deal['Chance']) == [0, 1, 2] for deal in decks), "Deals racing to refill the pool should all succeed"
+
+
+def test_pool_only_when_reused():
+    board = LocalBoard()
+    test_cases = [
+        (board.get_cards(), 0, "Tables built for one game should shuffle without a pool"),
+        (BoardCatalog(board, batch=8).get_cards(), 7, "Cached tables should deal from a pre-shuffled pool")
+    ]
+
+    for sut, pooled, message in test_cases:
+        sut.deal()
+        assert len(sut.pool) == pooled, message
@@ -0,0 +1,107 @@
+import copy
+import random
+from unittest.mock import patch
+
+import pytest
+
+from monopoly import actions
+from monopoly.engine import Engine, RandomStrategy, apply, apply_batch, options
+from monopoly.game import Game
+from monopoly.journal import Journal
+from monopoly.server import BoardCatalog, LocalBoard, new_game
+from monopoly.state import StateUpdater
+from tests.utils.serialize import new_player, new_property, new_set, new_state, serialize
+
+
+@serialize
+def state_with_player(position=0, cash=0):
+    return {
+        **new_state(),
+        'board': [new_property() for _ in range(40)],
+        'sets': [new_set(i) for i in range(4)],
+        'players': [
+            {**new_player(), 'position': position, 'cash': cash},
+            new_player()
+        ],
+        'action': actions.roll()
+    }
+
+
+@patch('monopoly.game.roll_dice')
+def test_apply(roll_dice):
+    roll_dice.return_value = (1, 2)
+    test_cases = [
+        (
+            state_with_player(position=0), actions.roll(),
+            actions.go_to(3),
+            "Roll should return move"
+        ),
+        (
+            state_with_player(position=0), actions.go_to(3),
+            actions.end_turn(),
+            "Action without follow-up should resume with end of turn"
+        ),
+        (
+            state_with_player(cash=100), actions.pay(50),
+            actions.end_turn(),
+            "Paying should resume with end of turn"
+        ),
+        (
+            state_with_player(), actions.end_turn(),
+            actions.roll(),
+            "End of turn should pass to next player"
+        )
+    ]
+
+    for state, action, expectedAction, message in test_cases:
+        sut = Game(state, StateUpdater(state))
+
+        gotAction = apply(sut, action)
+
+        assert gotAction == expectedAction, message
+        assert state.action == expectedAction, message
+
+
+def test_engine():
+    def random_engine():
+        return Engine(strategies=[RandomStrategy() for _ in range(2)], max_turns=100)
+
+    first, second = Engine().play(seed=1), Engine().play(seed=1)
+    other, same = random_engine().play(seed=2), random_engine().play(seed=2)
+
+    assert first == second and other == same, "Games with same seed should be identical"
+    assert first.turns > 0 and first.actions > first.turns, "Engine should play game to completion"
+    assert other.turns <= 100, "Engine should stop at turn limit"
+
+
+def test_apply_batch():
+    game, state = new_game(BoardCatalog(LocalBoard()), random.Random(1))
+    journal = Journal(state)
+    expected = copy.deepcopy(state)
+
+    with pytest.raises(KeyError):
+        apply_batch(game, [actions.roll(), {'action': 'goTo'}, {'action': 'mortgage', 'position': 0, 'amount': 1}])
+    assert state == expected, "Failed batch should restore the earlier state"
+    assert state.index.owners == expected.index.owners, "Failed batch should restore the index"
+
+    applied, pending = apply_batch(game, [actions.roll(), {'action': 'goTo'}, actions.roll()])
+
+    assert len(applied) == 2 and pending != actions.roll(), "Batch should stop at an action that is not on offer"
+    assert journal.rebuild() == state, "Journal should follow a rolled back batch"
+
+
+def test_auction_across_batches():
+    game, state = new_game(BoardCatalog(LocalBoard()), random.Random(1))
+    game.updater.set_action([actions.buy_property(1, 60), actions.auction(1, False)])
+
+    test_cases = [
+        ([actions.auction(1, False)], 'bid', "Batch should open the auction on offer"),
+        ([{'action': 'bid', 'amount': 10}], 'bid', "Next batch should pick up the running auction"),
+        ([actions.stay(), actions.stay()], 'endAuction', "Auction should end once the others stay")
+    ]
+
+    for batch, offered, message in test_cases:
+        applied, pending = apply_batch(game, batch)
+
+        assert applied == batch, message
+        assert options(pending)[0]['action'] == offered and state.action == pending, message
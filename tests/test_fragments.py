@@ -0,0 +1,19 @@
+from monopoly.fragments import FragmentCache
+from tests.utils.client import new_client
+
+
+def test_fragment_cache():
+    sut = FragmentCache(capacity=10)
+    client, game = new_client(sut)
+    test_cases = [
+        (lambda: client.get(game), 0, 7, "First view should render players, then cards and properties for each player"),
+        (lambda: client.get(game), 1, 0, "Unchanged game should be served from cache"),
+        (lambda: client.post(f'{game}/roll'), 0, 7, "Action should render fragments for the new version")
+    ]
+
+    for request, hits, misses, message in test_cases:
+        before = sut.stats.copy()
+        assert request().status_code == 200, message
+        assert (sut.stats['hits'] - before['hits'], sut.stats['misses'] - before['misses']) == (hits, misses), message
+
+    assert len(sut.fragments) <= 10 and sut.stats['evictions'] > 0, "Cache should evict beyond capacity"
@@ -2,9 +2,9 @@ from unittest.mock import patch
 
 from faker import Faker
 from monopoly import actions
-from monopoly.game import Game
+from monopoly.game import Game, find_next
 from monopoly.state import StateUpdater
-from tests.utils.serialize import new_player, new_property, new_set, new_state, serialize
+from tests.utils.serialize import cards, new_player, new_property, new_set, new_state, serialize
 
 
 @serialize
@@ -364,9 +364,9 @@ def test_collect_card():
 
     def query(state):
         return {
-            'decks': { name: state.decks[name] },
+            'decks': { name: cards(state, state.decks[name]) },
             'players': [
-                { 'cards': state.players[state.player].cards }
+                { 'cards': cards(state, state.players[state.player].cards) }
             ]
         }
 
@@ -395,9 +395,9 @@ def test_use_card():
     def query(state):
         player = state.players[state.player]
         return {
-            'decks': { name: state.decks[name] },
+            'decks': { name: cards(state, state.decks[name]) },
             'players': [
-                {k: vars(player)[k] for k in ['in_jail', 'cards']}
+                {'in_jail': player.in_jail, 'cards': cards(state, player.cards)}
             ]
         }
     
@@ -536,7 +536,7 @@ def test_draw_card():
 
         gotState, gotAction = state, sut.draw_card()
 
-        assert gotState.decks == expectedState, message
+        assert {name: cards(gotState, deck) for name, deck in gotState.decks.items()} == expectedState, message
         assert gotAction == expectedAction, message
 
 
@@ -974,3 +974,95 @@ def test_develop():
         gotState, _ = state, sut.develop(position, amount)
 
         assert query(gotState) == expectedState, message
+
+
+def test_set_index():
+    position = 5
+    residential = 1
+
+    def residential_set(total):
+        return [
+            {**new_property(), 'set': residential, 'price': 100, 'rent': [10]}
+            for _ in range(total)
+        ]
+
+    def with_building_cost(cost):
+        sets = [new_set(i) for i in range(4)]
+        sets[residential] = new_set(residential, cost)
+        return sets
+
+    def buy_all(sut):
+        for i in range(3):
+            sut.buy_property(position + i, 0)
+
+    def buy_and_mortgage(sut):
+        buy_all(sut)
+        sut.mortgage(position + 1, 50)
+
+    def buy_and_develop(sut):
+        buy_all(sut)
+        sut.develop(position, 50)
+
+    test_cases = [
+        (
+            buy_all, lambda sut: sut.use_property(position),
+            [actions.auction(position, True), actions.mortgage(position, 50), actions.develop(position, 50)],
+            "Buying full set should allow development"
+        ),
+        (
+            buy_and_mortgage, lambda sut: sut.use_property(position),
+            [actions.auction(position, True), actions.mortgage(position, 50)],
+            "Mortgaging set member should prevent development"
+        ),
+        (
+            buy_and_develop, lambda sut: sut.use_property(position + 1),
+            [actions.auction(position + 1, True), actions.mortgage(position + 1, 50), actions.develop(position + 1, 50)],
+            "Developing set member should allow development of least built member"
+        ),
+        (
+            buy_and_develop, lambda sut: sut.use_property(position),
+            [actions.auction(position, True), actions.demolish(position, 25)],
+            "Developing set member should allow demolition of most built member"
+        )
+    ]
+
+    for arrange, act, expectedAction, message in test_cases:
+        state = state_with_player(board=board_with_set(position, residential_set(3)), sets=with_building_cost(50), cash=1000)
+        sut = Game(state, StateUpdater(state))
+
+        arrange(sut)
+        gotAction = act(sut)
+
+        assert gotAction == expectedAction, message
+
+
+def test_find_next():
+    utility = 2
+
+    def board_with_utilities(size, positions):
+        board = [new_property() for _ in range(size)]
+        for position in positions:
+            board[position] = {**new_property(), 'set': utility}
+        return board
+
+    test_cases = [
+        (
+            state_with_player(board=board_with_utilities(40, [9, 12]), position=5), utility, 9,
+            "Player should advance to nearest square of type"
+        ),
+        (
+            state_with_player(board=board_with_utilities(40, [12, 28]), position=30), utility, 12,
+            "Player should wrap around board to nearest square of type"
+        ),
+        (
+            state_with_player(board=board_with_utilities(60, [12, 50]), position=45), utility, 50,
+            "Player should advance to nearest square of type on larger board"
+        ),
+        (
+            state_with_player(board=board_with_utilities(40, []), position=5), utility, 5,
+            "Player should stay given no square of type"
+        )
+    ]
+
+    for state, type, expectedPosition, message in test_cases:
+        assert find_next(state, type) == expectedPosition, message
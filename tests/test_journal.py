@@ -0,0 +1,48 @@
+import random
+import sqlite3
+
+from monopoly import actions
+from monopoly.journal import Journal, replay
+from monopoly.server import BoardCatalog, GameServer, LocalBoard, new_game
+from monopoly.store import SqliteStore
+from tests.utils.play import play
+
+
+def test_journal():
+    test_cases = [
+        (1000, 150, "Replaying every event should rebuild the state"),
+        (50, 150, "Replaying events after the latest snapshot should rebuild the state")
+    ]
+
+    for every, steps, message in test_cases:
+        game, state = new_game(BoardCatalog(LocalBoard()), random.Random(every))
+        journal = Journal(state, every)
+        play(game, actions.roll(), steps)
+
+        assert len(journal.events) < every, "Journal should compact into a snapshot"
+        assert journal.rebuild() == state, message
+        assert replay(journal.snapshot, journal.events).journal is None, "Replay should not record events"
+
+
+def test_sqlite_store_events(tmp_path):
+    path = str(tmp_path / 'games.db')
+    board = BoardCatalog(LocalBoard())
+    sut = GameServer(board, SqliteStore(path, snapshot_every=40))
+    id = sut.create()
+
+    pending = actions.roll()
+    for _ in range(30):
+        with sut.checkout(id) as (game, _):
+            pending = play(game, pending, 3)
+    with sut.checkout(id) as (game, _):
+        pass
+
+    _, state = sut.get(id)
+    _, loaded = GameServer(board, SqliteStore(path)).get(id)
+    version, events = sqlite3.connect(path).execute(
+        'SELECT version, (SELECT COUNT(*) FROM events WHERE game = games.id) FROM games WHERE id = ?', (id,)
+    ).fetchone()
+
+    assert loaded == state, "Another worker should rebuild the game from snapshot and events"
+    assert version == 30, "Checkouts without changes should not bump the version"
+    assert 0 < events < 30, "Snapshots should replace the events written before them"
@@ -0,0 +1,260 @@
+import os
+import sys
+import time
+from threading import Thread
+
+from monopoly.server import Board, BoardCatalog, GameServer, LocalBoard
+from monopoly.store import SpillStore, SqliteStore
+from tests.utils.board_server import BoardServer
+
+
+class FakeSource:
+    def __init__(self, catalog, etag='v1'):
+        self.catalog = catalog
+        self.etag = etag
+        self.loads = 0
+
+    def load(self, etag=None):
+        self.loads += 1
+        if etag == self.etag:
+            return None, etag
+        return self.catalog, self.etag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def new_catalog():
+    return {
+        'sets': [{'type': 0}],
+        'properties': [{'name': 'Go'} for _ in range(40)],
+        'chance': [{'action': 'collect', 'amount': 10}],
+        'communityChest': [{'action': 'pay', 'amount': 10}]
+    }
+
+
+def test_board_catalog():
+    test_cases = [
+        (
+            [0, 10, 20], 60, 1,
+            "Catalog should load once within TTL"
+        ),
+        (
+            [0, 60, 120], 60, 3,
+            "Catalog should revalidate after TTL"
+        )
+    ]
+
+    for times, ttl, expectedLoads, message in test_cases:
+        source, clock = FakeSource(new_catalog()), FakeClock()
+        sut = BoardCatalog(source, ttl=ttl, clock=clock)
+
+        for now in times:
+            clock.now = now
+            gotCatalog = sut.get()
+
+        assert source.loads == expectedLoads, message
+        assert gotCatalog == new_catalog(), message
+
+
+def test_board_catalog_etag():
+    source, clock = FakeSource(new_catalog()), FakeClock()
+    sut = BoardCatalog(source, ttl=0, clock=clock)
+    first = sut.get()
+
+    source.catalog = {**new_catalog(), 'sets': []}
+    unchanged = sut.get()
+
+    source.etag = 'v2'
+    changed = sut.get()
+
+    assert unchanged is first, "Catalog should keep parsed copy when ETag is unchanged"
+    assert changed['sets'] == [], "Catalog should replace parsed copy when ETag changes"
+
+
+def test_local_board():
+    sut = LocalBoard('json/board.json')
+
+    catalog, etag = sut.load()
+    unchanged, _ = sut.load(etag)
+
+    assert len(catalog['properties']) == 40, "Local board should read board file"
+    assert unchanged is None, "Local board should not reread unchanged file"
+
+
+def test_create_game():
+    source = FakeSource(new_catalog())
+    sut = GameServer(BoardCatalog(source))
+
+    first, second = sut.create(), sut.create()
+    _, state = sut.get(first)
+    state.board[1]['owner'] = 0
+    _, other = sut.get(second)
+
+    assert source.loads == 1, "Server should create games from cached catalog"
+    assert 'owner' not in other.board[1], "Games should not share mutable board data"
+
+
+def test_board_client():
+    with BoardServer() as stub:
+        sut = Board(stub.port, backoff=0)
+
+        catalog, etag = sut.load()
+        unchanged, _ = sut.load(etag)
+        sets = sut.get_sets()
+
+        assert stub.requests == ['/db', '/db', '/db'], "Board should load whole catalog in one request"
+        assert len(stub.connections) == 1, "Board should reuse pooled connection"
+        assert len(catalog['properties']) == 40 and sets == catalog['sets'], "Board should return board data"
+        assert unchanged is None, "Board should revalidate catalog by ETag"
+        assert [resource for resource, _, _ in sut.timings] == ['db', 'db', 'db'], "Board should record fetch latency"
+
+
+def test_board_client_retry():
+    with BoardServer(failures=2) as stub:
+        sut = Board(stub.port, retries=3, backoff=0)
+
+        catalog, _ = sut.load()
+
+        assert len(stub.requests) == 3, "Board should retry unavailable server"
+        assert len(catalog['chance']) == 16, "Board should load catalog after retrying"
+
+
+def test_spill_store(tmp_path):
+    clock = FakeClock()
+    sut = GameServer(BoardCatalog(FakeSource(new_catalog())), SpillStore(str(tmp_path), capacity=2, idle=60, clock=clock))
+
+    first = sut.create()
+    _, state = sut.get(first)
+    state.players[0].cash = 100
+    second, third = sut.create(), sut.create()
+    evicted = dict(sut.store.stats)
+
+    _, restored = sut.get(first)
+    clock.now = 120
+    sut.get(third)
+
+    assert evicted == {'hits': 1, 'evictions': 1}, "Store should evict least recently used game over capacity"
+    assert restored.players[0].cash == 100, "Evicted game should be restored from disk"
+    assert sut.store.stats['misses'] == 1, "Restoring evicted game should count as miss"
+    assert list(sut.store.games) == [third], "Store should evict idle games"
+    assert all(sut.exists(id) for id in [first, second, third]), "Evicted games should still exist"
+    sut.store.flush()
+    assert next(SpillStore(str(tmp_path)).ids) == 3, "New store should not reuse spilled ids"
+
+
+def test_spill_store_pins_checkouts(tmp_path):
+    sut = GameServer(BoardCatalog(FakeSource(new_catalog())), SpillStore(str(tmp_path), capacity=1))
+    held = sut.create()
+
+    with sut.checkout(held):
+        others = [sut.create() for _ in range(3)]
+        pinned = list(sut.store.games)
+        spilled = os.path.exists(sut.store.path(held))
+
+    assert held in pinned and not spilled, "Checked out game should not be evicted"
+    assert others[0] not in pinned, "Games that are not checked out should still be evicted"
+    assert list(sut.store.games) == [held], "Store should shrink back to capacity once the checkout ends"
+
+
+def test_spill_store_visible_while_spilling(tmp_path):
+    class WatchedStore(SpillStore):
+        def spill(self, id, state):
+            seen.append(Thread(target=lambda: visible.append(id in self)))
+            seen[-1].start()
+            seen[-1].join(0.05)
+            visible.append(id in self.games)
+            super().spill(id, state)
+
+    seen, visible = [], []
+    sut = GameServer(BoardCatalog(FakeSource(new_catalog())), WatchedStore(str(tmp_path), capacity=1))
+    first = sut.create()
+    sut.create()
+    seen[-1].join()
+
+    assert visible == [True, True], "Game should stay in memory until its file is written"
+    assert sut.exists(first) and sut.version(first) == 0, "Spilled game should still be found"
+
+
+def test_spill_store_version(tmp_path):
+    sut = GameServer(BoardCatalog(FakeSource(new_catalog())), SpillStore(str(tmp_path), capacity=1))
+    first = sut.create()
+    with sut.checkout(first) as (game, _):
+        game.pay_bank(10)
+    second = sut.create()
+
+    test_cases = [
+        (first, 1, "Spilled game should report the version it was written at"),
+        (second, 0, "Game in memory should report its version"),
+        (1000, None, "Missing game should have no version")
+    ]
+
+    for id, version, message in test_cases:
+        assert sut.version(id) == version, message
+    assert list(sut.store.games) == [second] and sut.store.stats['misses'] == 0, "Versions should be read without loading spilled games"
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / 'games.db')
+    workers = [GameServer(BoardCatalog(FakeSource(new_catalog())), SqliteStore(path)) for _ in range(2)]
+    id = workers[0].create()
+
+    def deposit(server):
+        for _ in range(25):
+            with server.checkout(id) as (game, _):
+                game.pay_bank(-1)
+
+    threads = [Thread(target=deposit, args=(server,)) for server in workers for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    _, first = workers[0].get(id)
+    _, second = workers[1].get(id)
+
+    assert workers[1].exists(id), "Game created by one worker should exist for another"
+    assert first.players[0].cash == second.players[0].cash == 1300, "Concurrent checkouts should not lose updates"
+    assert workers[0].get(id)[1] is first, "Unchanged game should be served from read cache"
+
+
+def test_concurrent_actions():
+    sut = GameServer(BoardCatalog(FakeSource(new_catalog())))
+    shared = sut.create()
+    ids, interleaved = [], []
+
+    def play():
+        own = sut.create()
+        ids.append(own)
+        for _ in range(200):
+            with sut.checkout(shared) as (game, state):
+                cash = state.players[0].cash
+                time.sleep(0)
+                game.pay_bank(-1)
+                if state.players[0].cash != cash + 1:
+                    interleaved.append(cash)
+            with sut.checkout(own) as (game, _):
+                game.pay_bank(-1)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [Thread(target=play) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    _, state = sut.get(shared)
+    assert not interleaved, "Actions on the same game should be serialized"
+    assert len(set(ids)) == 8 and shared not in ids, "Concurrently created games should have unique ids"
+    assert state.players[0].cash == 1200 + 8 * 200, "Actions on shared game should not lose updates"
+    assert all(sut.get(id)[1].players[0].cash == 1400 for id in ids), "Actions on separate games should all apply"
+    assert len(sut.locks) == 0, "Game locks should be dropped once no request holds them"
@@ -0,0 +1,16 @@
+from monopoly.server import LocalBoard
+from monopoly.simulation import simulate
+
+
+def test_simulate():
+    catalog = LocalBoard().get()
+
+    landings = simulate(catalog, tokens=2000, rolls=50, burn_in=10, batches=10, seed=1)
+    repeated = simulate(catalog, tokens=2000, rolls=50, burn_in=10, batches=10, seed=1)
+    by_name = {landing.name: landing for landing in landings}
+
+    assert abs(sum(landing.probability for landing in landings) - 1) < 1e-9, "Landing probabilities should sum to one"
+    assert by_name['Go To Jail'].probability == 0, "Tokens should never rest on Go To Jail"
+    assert max(landings, key=lambda landing: landing.probability).name == 'Jail', "Jail should be most visited square"
+    assert all(landing.low <= landing.probability <= landing.high for landing in landings), "Confidence interval should contain estimate"
+    assert landings == repeated, "Simulation should be reproducible from seed"
@@ -0,0 +1,76 @@
+import copy
+import random
+
+from monopoly import actions
+from monopoly.engine import PROPERTY_ACTIONS, apply
+from monopoly.index import BoardIndex
+from monopoly.model import PropertyType
+from monopoly.server import BoardCatalog, LocalBoard, new_game
+from tests.utils.play import play
+
+
+def test_fork():
+    board = BoardCatalog(LocalBoard())
+    test_cases = [
+        (0, 200, "Forked game should not change its parent"),
+        (200, 200, "Fork of a game in progress should not change its parent"),
+        (200, 1, "Single action on a fork should not change its parent")
+    ]
+
+    for before, after, message in test_cases:
+        game, state = new_game(board, random.Random(before))
+        pending = play(game, actions.roll(), before)
+        expected = copy.deepcopy(state)
+
+        child = game.fork(random.Random(1))
+        forked = child.state
+        play(child, pending, after)
+        assert state == expected, message
+        assert state.index.owners == expected.index.owners, "Fork should not change its parent's index"
+
+        replayed = copy.deepcopy(forked)
+        play(game, pending, after)
+        assert forked == replayed, "Parent should not change its fork"
+
+
+def test_owner_index():
+    board = BoardCatalog(LocalBoard())
+
+    def manage(game, rng):
+        for position in list(game.state.index.owned_by(game.state.player)):
+            choices = [option for option in game.use_property(position) if option['action'] in PROPERTY_ACTIONS]
+            if choices:
+                apply(game, rng.choice(choices))
+
+    def random_play(turns):
+        def arrange(game, rng):
+            pending = actions.roll()
+            for _ in range(turns):
+                pending = play(game, pending, 1)
+                manage(game, rng)
+        return arrange
+
+    def develop_set(game, rng):
+        set = next(set for set, members in game.state.index.members.items() if game.state.sets[set]['type'] == PropertyType.RESIDENTIAL.value)
+        for position in game.state.index.members[set]:
+            game.updater.acquire_property(position)
+        for _ in range(12):
+            manage(game, rng)
+
+    test_cases = [
+        (random_play(0), "New game should have no holdings"),
+        (random_play(300), "Holdings should follow purchases and mortgages"),
+        (develop_set, "Holdings should follow building and demolition")
+    ]
+
+    for arrange, message in test_cases:
+        rng = random.Random(1)
+        game, state = new_game(board, rng)
+        arrange(game, rng)
+
+        expected = BoardIndex(state.board, state.sets)
+        for player in range(len(state.players)):
+            owned = [position for position, property in enumerate(state.board) if property.get('owner') == player]
+            assert state.index.owned_by(player) == owned, message
+            assert state.index.totals(player) == expected.totals(player), message
+            assert state.index.totals(player)['properties'] == len(owned), message
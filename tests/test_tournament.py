@@ -0,0 +1,26 @@
+from monopoly.tournament import Config, run
+
+
+def final(standings):
+    *_, last = standings
+    return last.summary()
+
+
+def test_tournament(tmp_path):
+    config = Config(['greedy', 'random'], seed=1, chunk=2, max_turns=50, board='json/board.json')
+    checkpoint = str(tmp_path / 'checkpoint.jsonl')
+
+    serial = final(run(config, games=8, workers=1))
+    parallel = final(run(config, games=8, workers=2))
+    interrupted = final(run(config, games=4, workers=2, checkpoint=checkpoint))
+    resumed = final(run(config, games=8, workers=2, checkpoint=checkpoint))
+    uneven = str(tmp_path / 'uneven.jsonl')
+    final(run(config, games=5, workers=2, checkpoint=uneven))
+    final(run(config, games=7, workers=2, checkpoint=uneven))
+    resumed_uneven = final(run(config, games=8, workers=2, checkpoint=uneven))
+
+    assert serial['games'] == 8 and sum(serial['wins'].values()) == 8, "Tournament should record every game"
+    assert parallel == serial, "Results should not depend on number of workers"
+    assert interrupted['games'] == 4, "Tournament should stop at requested number of games"
+    assert resumed == serial, "Resumed tournament should match uninterrupted tournament"
+    assert resumed_uneven == serial, "Resuming part way through a chunk should play only the missing games"
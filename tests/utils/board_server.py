@@ -0,0 +1,62 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class BoardServer:
+    ''' Local stand-in for json-server, serving a board file over keep-alive HTTP '''
+    def __init__(self, path='json/board.json', failures=0):
+        with open(path) as file:
+            self.db = json.load(file)
+        self.failures = failures
+        self.requests = []
+        self.connections = set()
+        self.httpd = ThreadingHTTPServer(('localhost', 0), self.handler())
+        self.port = self.httpd.server_address[1]
+
+    def handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requests.append(self.path)
+                server.connections.add(self.client_address)
+                if server.failures > 0:
+                    server.failures -= 1
+                    return self.respond(503, b'')
+
+                resource = self.path.strip('/')
+                if resource != 'db' and resource not in server.db:
+                    return self.respond(404, b'')
+
+                body = json.dumps(server.db if resource == 'db' else server.db[resource]).encode()
+                etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self.respond(304, b'', etag)
+                
+                self.respond(200, body, etag)
+
+            def respond(self, status, body, etag=None):
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,11 @@
+from flask import Flask
+
+from api import configure_routing
+from monopoly.server import BoardCatalog, GameServer, LocalBoard
+
+
+def new_client(fragments=None, store=None, **options):
+    app = Flask('api')
+    configure_routing(app, GameServer(BoardCatalog(LocalBoard()), store), fragments, **options)
+    client = app.test_client()
+    return client, client.get('/').location
@@ -0,0 +1,11 @@
+from monopoly.engine import apply, options
+
+
+def play(game, pending, steps):
+    for _ in range(steps):
+        choices = options(pending)
+        if choices[0]['action'] == 'bid':
+            pending = game.pass_auction()
+        else:
+            pending = apply(game, choices[0])
+    return pending
@@ -1,3 +1,4 @@
+from collections import deque
 from faker import Faker
 from monopoly.model import Player, Property
 from monopoly.state import GameState
@@ -42,9 +43,25 @@ def new_set(type, building=0):
     }
 
 
+def deal(state):
+    decks = state['decks'].values()
+    hands = [player['cards'] for player in state['players']]
+    state['cards'] = [card for cards in [*decks, *hands] for card in cards]
+
+    ids = iter(range(len(state['cards'])))
+    state['decks'] = {name: deque(next(ids) for _ in deck) for name, deck in state['decks'].items()}
+    for player, hand in zip(state['players'], hands):
+        player['cards'] = [next(ids) for _ in hand]
+
+
+def cards(state, ids):
+    return [state.cards[id] for id in ids]
+
+
 def serialize(func):
     def inner(*args, **kwargs):
         state = func(*args, **kwargs)
+        deal(state)
         state['players'] = [Player(**player) for player in state['players']]
         return GameState(**state)
     